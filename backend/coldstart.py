@@ -0,0 +1,181 @@
+import hashlib
+import logging
+import os
+import time
+from typing import Optional
+
+from sqlalchemy import exists, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend import search
+from backend.database import Base, ensure_indexes
+from backend.models import ArticleCategory, NewsArticle, SchemaVersion
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Seconds from process start to the first HTTP response; exceeding it logs a warning and shows
+# in /api/health/startup (benchmarks/cold_start.py fails on it). 0 disables the check.
+STARTUP_BUDGET_SECONDS = float(os.getenv("STARTUP_BUDGET_SECONDS", "0"))
+# "auto" skips create_all / index / FTS setup when the stored schema version matches;
+# "always" runs them on every boot
+SCHEMA_SYNC = os.getenv("SCHEMA_SYNC", "auto").lower()
+
+
+def _process_age() -> Optional[float]:
+    """Seconds since this process was exec'd (Linux /proc; None elsewhere)"""
+    try:
+        with open("/proc/self/stat") as f:
+            # Field 22 (starttime, in clock ticks since boot); the command name may contain spaces
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# Phase timestamps are measured from process start, so interpreter and uvicorn start-up count
+_origin = time.perf_counter() - (_process_age() or 0.0)
+_phases = {}
+_schema = {"version": None, "synced": None}
+
+
+def elapsed() -> float:
+    return time.perf_counter() - _origin
+
+
+def mark(phase: str):
+    """Record that a startup phase finished (imports, schema, app_ready, first_response)"""
+    _phases.setdefault(phase, elapsed())
+
+
+def schema_fingerprint(extra=()) -> str:
+    """Hash of every table, column, index and constraint on the models (plus extra DDL)"""
+    parts = []
+    for table in Base.metadata.sorted_tables:
+        parts.append(table.name)
+        parts += [f"{c.name} {c.type!r} {c.nullable} {c.primary_key}" for c in table.columns]
+        parts += sorted(f"index {i.name} {[c.name for c in i.columns]} {i.unique}" for i in table.indexes)
+        parts += sorted(f"{type(c).__name__} {sorted(col.name for col in c.columns)}" for c in table.constraints)
+    parts += list(extra)
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def _stored_version(engine) -> Optional[str]:
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(SchemaVersion.version).limit(1)).scalar()
+    except SQLAlchemyError:
+        # No schema_version table yet
+        return None
+
+
+def _backfill_article_categories(conn):
+    """List articles stored before feeds had their own table under the category they carry"""
+    linked = select(ArticleCategory.article_id).where(
+        ArticleCategory.article_id == NewsArticle.id,
+        ArticleCategory.category == NewsArticle.category,
+    )
+    conn.execute(insert(ArticleCategory).from_select(
+        ["article_id", "category", "published_at"],
+        select(NewsArticle.id, NewsArticle.category, NewsArticle.published_at).where(
+            NewsArticle.category.isnot(None), ~exists(linked)
+        )
+    ))
+
+
+def _normalize_created_at(conn):
+    """
+    Rows written by the old server_default hold CURRENT_TIMESTAMP text ('YYYY-MM-DD HH:MM:SS'),
+    which sorts before the same instant bound as a parameter ('... HH:MM:SS.000000'), so the
+    /saved keyset cursor matched its own row again. Rewrite them in the bound format.
+    """
+    if conn.dialect.name != "sqlite":
+        return
+    conn.exec_driver_sql(
+        "UPDATE articles SET created_at = created_at || '.000000' WHERE length(created_at) = 19"
+    )
+
+
+# Data fixes run with every schema sync; they are idempotent, and their names are part of the
+# schema version so adding one makes already-synced databases sync again
+DATA_MIGRATIONS = (_backfill_article_categories, _normalize_created_at)
+
+
+def prepare_schema(engine) -> bool:
+    """
+    Create missing tables, indexes and the search index, unless the database was already
+    synced to this code's schema fingerprint. One query on a warm boot instead of
+    per-table reflection. Returns whether a sync ran.
+    """
+    extra = [migration.__name__ for migration in DATA_MIGRATIONS]
+    if search.is_supported(engine):
+        extra += list(search.FTS_DDL)
+    version = schema_fingerprint(extra)
+    _schema["version"] = version
+    if SCHEMA_SYNC != "always" and _stored_version(engine) == version:
+        _schema["synced"] = False
+        return False
+
+    Base.metadata.create_all(bind=engine)
+    ensure_indexes(engine)
+    search.setup_search(engine)
+    with engine.begin() as conn:
+        for migration in DATA_MIGRATIONS:
+            migration(conn)
+        conn.execute(SchemaVersion.__table__.delete())
+        conn.execute(SchemaVersion.__table__.insert().values(id=1, version=version))
+    logger.info(f"Database schema synced to version {version}")
+    _schema["synced"] = True
+    return True
+
+
+def _check_budget():
+    total = _phases["first_response"]
+    if STARTUP_BUDGET_SECONDS and total > STARTUP_BUDGET_SECONDS:
+        logger.warning(f"First response {total:.2f}s after process start, over the "
+                       f"{STARTUP_BUDGET_SECONDS:.2f}s startup budget ({stats()['phases']})")
+    else:
+        logger.info(f"First response {total:.2f}s after process start")
+
+
+class FirstResponseMiddleware:
+    """Marks when the first HTTP response finishes; a flag check per request after that"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or "first_response" in _phases:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                if "first_response" not in _phases:
+                    mark("first_response")
+                    _check_budget()
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def collect():
+    """Metrics collector: startup phase timestamps"""
+    yield "startup_phase_seconds", "Seconds from process start to the end of each startup phase", "gauge", [
+        ({"phase": phase}, round(seconds, 4)) for phase, seconds in _phases.items()
+    ]
+
+
+def stats() -> dict:
+    first_response = _phases.get("first_response")
+    return {
+        "phases": {phase: round(seconds, 3) for phase, seconds in _phases.items()},
+        "budget_seconds": STARTUP_BUDGET_SECONDS or None,
+        "within_budget": (first_response <= STARTUP_BUDGET_SECONDS
+                          if STARTUP_BUDGET_SECONDS and first_response is not None else None),
+        "schema_version": _schema["version"],
+        "schema_synced": _schema["synced"],
+    }
@@ -0,0 +1,7 @@
+"""
+Process-wide settings bootstrap. Importing this module loads .env into the environment,
+once per process; modules that read os.getenv at import time import it first.
+"""
+from dotenv import load_dotenv
+
+load_dotenv()
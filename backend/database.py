@@ -1,24 +1,50 @@
-from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 import os
-
-load_dotenv()
+# Before storage, whose pool and pragma settings are read at import
+from backend import config  # noqa: F401  (loads .env)
+from backend.storage import create_engine_from_url, create_async_engine_from_url
 
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./news_summarizer.db")
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+# SQLite pragmas / pool sizing / PostgreSQL pooling live in backend/storage.py
+engine = create_engine_from_url(SQLALCHEMY_DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Request handlers use the async engine so queries don't block the event loop; background
+# workers and scripts keep using SessionLocal. Objects stay usable after commit for responses.
+async_engine = create_async_engine_from_url(SQLALCHEMY_DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
+def ensure_indexes(bind=None):
+    """
+    create_all only creates indexes together with new tables; add any index declared on the
+    models that an existing database is missing.
+    """
+    bind = bind or engine
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
+def dialect_insert(db):
+    """INSERT construct for the bound dialect, so ON CONFLICT / RETURNING are available"""
+    if db.bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
 # Dependency
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db 
\ No newline at end of file
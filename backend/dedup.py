@@ -0,0 +1,202 @@
+import hashlib
+import logging
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from backend.database import dialect_insert
+from backend.models import ArticleSignature, NewsArticle
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Signatures within this many differing bits are the same story (at most 3 keeps the
+# four-band lookup exact)
+DEDUP_MAX_DISTANCE = min(int(os.getenv("DEDUP_MAX_DISTANCE", "3")), 3)
+# Only articles signed this recently are considered as cluster representatives
+DEDUP_WINDOW_DAYS = int(os.getenv("DEDUP_WINDOW_DAYS", "3"))
+# Enrichment of duplicates is delayed so the representative is usually done first
+DEDUP_FOLLOWER_DELAY_SECONDS = int(os.getenv("DEDUP_FOLLOWER_DELAY_SECONDS", "120"))
+
+BANDS = 4
+BAND_BITS = 16
+# Placeholder stored by ingestion when NewsAPI has no description
+_PLACEHOLDER_DESCRIPTION = "No description available"
+# NewsAPI titles usually end in " - Outlet Name", which differs between copies of a story
+_SOURCE_SUFFIX = re.compile(r"\s+[-–|]\s+[^-–|]{1,60}$")
+
+
+def _features(text: str) -> List[str]:
+    """Word unigrams and bigrams of normalized text"""
+    words = re.findall(r"\w+", text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def simhash(text: str) -> int:
+    """Unsigned 64-bit SimHash"""
+    weights = [0] * 64
+    for feature in _features(text):
+        h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+
+def bands(h: int) -> List[int]:
+    mask = (1 << BAND_BITS) - 1
+    return [(h >> (i * BAND_BITS)) & mask for i in range(BANDS)]
+
+
+def distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _to_signed(h: int) -> int:
+    return h - (1 << 64) if h >= 1 << 63 else h
+
+
+def _to_unsigned(h: int) -> int:
+    return h + (1 << 64) if h < 0 else h
+
+
+def article_text(title: Optional[str], description: Optional[str]) -> str:
+    if description == _PLACEHOLDER_DESCRIPTION:
+        description = None
+    if title:
+        title = _SOURCE_SUFFIX.sub("", title)
+    return " ".join(part for part in (title, description) if part)
+
+
+def assign_clusters(db: Session, article_ids: Iterable[int]) -> Dict[int, int]:
+    """
+    Sign articles and attach each to the cluster of its nearest recent near-duplicate, or start
+    a new cluster. Candidates come from one query on the band indexes. Does not commit.
+    Returns {article_id: cluster_id} for the articles signed.
+    """
+    article_ids = list(article_ids)
+    if not article_ids:
+        return {}
+    rows = db.query(NewsArticle.id, NewsArticle.title, NewsArticle.description).filter(
+        NewsArticle.id.in_(article_ids)
+    ).order_by(NewsArticle.id).all()
+
+    signatures = {}
+    for article_id, title, description in rows:
+        text = article_text(title, description)
+        if text:
+            signatures[article_id] = simhash(text)
+    if not signatures:
+        return {}
+
+    band_values = [set() for _ in range(BANDS)]
+    for h in signatures.values():
+        for i, value in enumerate(bands(h)):
+            band_values[i].add(value)
+    band_columns = [ArticleSignature.band0, ArticleSignature.band1, ArticleSignature.band2, ArticleSignature.band3]
+    candidates = db.query(ArticleSignature.simhash, ArticleSignature.cluster_id).filter(
+        ArticleSignature.created_at >= datetime.utcnow() - timedelta(days=DEDUP_WINDOW_DAYS),
+        ArticleSignature.article_id.notin_(list(signatures)),
+        or_(*(column.in_(values) for column, values in zip(band_columns, band_values)))
+    ).all()
+    pool = [(_to_unsigned(h), cluster_id) for h, cluster_id in candidates]
+
+    clusters, values = {}, []
+    for article_id, h in signatures.items():
+        best = min(((distance(h, other), cluster_id) for other, cluster_id in pool), default=None)
+        cluster_id = best[1] if best and best[0] <= DEDUP_MAX_DISTANCE else article_id
+        # Later articles in the same batch can join this one's cluster
+        pool.append((h, cluster_id))
+        clusters[article_id] = cluster_id
+        band0, band1, band2, band3 = bands(h)
+        values.append({
+            "article_id": article_id, "simhash": _to_signed(h),
+            "band0": band0, "band1": band1, "band2": band2, "band3": band3,
+            "cluster_id": cluster_id, "created_at": datetime.utcnow(),
+        })
+
+    insert = dialect_insert(db)
+    db.execute(insert(ArticleSignature).values(values).on_conflict_do_nothing(index_elements=["article_id"]))
+    duplicates = sum(1 for article_id, cluster_id in clusters.items() if article_id != cluster_id)
+    if duplicates:
+        logger.info(f"Clustered {duplicates} of {len(clusters)} new articles as near-duplicates")
+    return clusters
+
+
+def representative(db: Session, article: NewsArticle) -> Optional[NewsArticle]:
+    """The article whose summary/translations this one can reuse, if it is a duplicate"""
+    cluster_id = db.query(ArticleSignature.cluster_id).filter(
+        ArticleSignature.article_id == article.id
+    ).scalar()
+    if cluster_id is None or cluster_id == article.id:
+        return None
+    return db.query(NewsArticle).filter(NewsArticle.id == cluster_id).first()
+
+
+def collapse(db: Session, articles: List[NewsArticle], limit: Optional[int] = None) -> List[NewsArticle]:
+    """Keep the first article of each story cluster (input order is preserved)"""
+    ids = [article.id for article in articles]
+    if not ids:
+        return articles
+    clusters = dict(
+        db.query(ArticleSignature.article_id, ArticleSignature.cluster_id).filter(
+            ArticleSignature.article_id.in_(ids)
+        ).all()
+    )
+    seen, result = set(), []
+    for article in articles:
+        cluster_id = clusters.get(article.id, article.id)
+        if cluster_id in seen:
+            continue
+        seen.add(cluster_id)
+        result.append(article)
+    return result[:limit] if limit else result
+
+
+def stats(db: Session) -> dict:
+    signed = db.query(func.count(ArticleSignature.article_id)).scalar()
+    duplicates = db.query(func.count(ArticleSignature.article_id)).filter(
+        ArticleSignature.article_id != ArticleSignature.cluster_id
+    ).scalar()
+    clusters = db.query(func.count(func.distinct(ArticleSignature.cluster_id))).filter(
+        ArticleSignature.article_id != ArticleSignature.cluster_id
+    ).scalar()
+    return {"signed": signed, "duplicates": duplicates, "multi_article_clusters": clusters}
+
+
+def backfill(db: Session, batch_size: int = 500) -> int:
+    """Sign stored articles that predate the signature table, oldest first"""
+    total = 0
+    while True:
+        ids = [article_id for (article_id,) in db.query(NewsArticle.id).outerjoin(
+            ArticleSignature, ArticleSignature.article_id == NewsArticle.id
+        ).filter(ArticleSignature.article_id.is_(None)).order_by(NewsArticle.id).limit(batch_size).all()]
+        if not ids:
+            return total
+        assign_clusters(db, ids)
+        # Articles without any text get no signature; give them one of their own so the loop ends
+        db.execute(dialect_insert(db)(ArticleSignature).values([
+            {"article_id": article_id, "cluster_id": article_id, "created_at": datetime.utcnow()}
+            for article_id in ids
+        ]).on_conflict_do_nothing(index_elements=["article_id"]))
+        db.commit()
+        total += len(ids)
+
+
+if __name__ == "__main__":
+    from backend.database import Base, SessionLocal, engine
+
+    if sys.argv[1:] != ["backfill"]:
+        print("usage: python -m backend.dedup backfill")
+        sys.exit(2)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        print(f"Signed {backfill(session)} articles")
+    finally:
+        session.close()
@@ -0,0 +1,284 @@
+from sqlalchemy import update
+from typing import Optional
+from datetime import datetime
+import asyncio
+import os
+import logging
+from backend.models import NewsArticle, ArticleTranslation
+from backend.languages import is_supported
+from backend import dedup, llm_cache, groq_scheduler
+from backend.database import SessionLocal, dialect_insert
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Model used for background summaries/translations
+ENRICHMENT_MODEL = os.getenv("ENRICHMENT_MODEL", "llama-3.1-8b-instant")
+# Language stored in translated_title / translated_description
+ENRICHMENT_TARGET_LANG = os.getenv("ENRICHMENT_TARGET_LANG", "hi")
+# Languages precomputed into article_translations after ingestion
+HOT_LANGUAGES = [
+    lang.strip().lower() for lang in os.getenv("HOT_LANGUAGES", "hi,es,fr").split(",")
+    if is_supported(lang.strip())
+]
+
+class EnrichmentError(Exception):
+    """A Groq call needed for enrichment failed; the job should be retried"""
+
+def parse_datetime(date_str: str) -> datetime:
+    try:
+        if not date_str:
+            return datetime.utcnow()
+        return datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%SZ")
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Error parsing datetime {date_str}: {str(e)}")
+        return datetime.utcnow()
+
+async def call_groq_api(prompt: str, model: str = ENRICHMENT_MODEL, cache_key: Optional[str] = None,
+                        task_type: Optional[str] = None) -> str:
+    """Call Groq API with a prompt and return the response; raises EnrichmentError on failure"""
+    if not prompt:
+        return ""
+
+    if cache_key:
+        cached = await llm_cache.lookup(cache_key)
+        if cached is not None:
+            return cached
+    
+    try:
+        api_key = os.getenv("GROQ_API_KEY")
+        if not api_key:
+            logger.error("GROQ_API_KEY not found in environment variables")
+            raise EnrichmentError("GROQ_API_KEY not configured")
+
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        data = {
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are a professional translator and summarizer. Provide accurate and natural translations while maintaining the original meaning."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "model": model,
+            "temperature": 0.3,
+            "max_tokens": 1000
+        }
+        
+        # Background enrichment yields to interactive requests under the shared rate limits
+        response = await groq_scheduler.post_chat_completion(data, headers, groq_scheduler.PRIORITY_BACKGROUND)
+        
+        if response.status_code == 200:
+            result = response.json()
+            content = result["choices"][0]["message"]["content"].strip()
+            # Only successful completions are cached
+            if cache_key:
+                await llm_cache.store(cache_key, content, task_type, model)
+            return content
+        else:
+            logger.error(f"Groq API error: {response.status_code} - {response.text}")
+            raise EnrichmentError(f"Groq API error: {response.status_code}")
+    except EnrichmentError:
+        raise
+    except Exception as e:
+        logger.error(f"Error calling Groq API: {str(e)}")
+        raise EnrichmentError(f"Error calling Groq API: {str(e)}")
+
+async def translate_text(text: str, target_lang: str) -> str:
+    """Translate text using Groq API with language-specific instructions"""
+    if not text:
+        return ""
+    
+    language_prompts = {
+        'ar': 'Translate to Modern Standard Arabic:',
+        'bn': 'Translate to Standard Bengali:',
+        'zh': 'Translate to Simplified Chinese:',
+        'en': 'Translate to English:',
+        'fr': 'Translate to French:',
+        'de': 'Translate to German:',
+        'hi': 'Translate to Hindi:',
+        'id': 'Translate to Indonesian:',
+        'it': 'Translate to Italian:',
+        'ja': 'Translate to Japanese:',
+        'ko': 'Translate to Korean:',
+        'pt': 'Translate to Portuguese:',
+        'ru': 'Translate to Russian:',
+        'es': 'Translate to Spanish:',
+        'tr': 'Translate to Turkish:'
+    }
+    
+    prompt = f"""{language_prompts.get(target_lang, f'Translate to {target_lang}:')}
+
+{text}
+
+Translate the above text naturally and accurately, maintaining the original meaning and tone."""
+    
+    return await call_groq_api(
+        prompt,
+        cache_key=llm_cache.make_key(text, "translation", target_lang, ENRICHMENT_MODEL),
+        task_type="translation"
+    )
+
+async def summarize_text(text: str, max_length: int = 150) -> str:
+    """Summarize text using Groq API"""
+    if not text:
+        return ""
+    
+    prompt = f"""Summarize the following text in about {max_length} characters. Provide ONLY the summary, no explanations:
+
+{text}"""
+    
+    return await call_groq_api(
+        prompt,
+        cache_key=llm_cache.make_key(text, "summarization", None, ENRICHMENT_MODEL, max_length),
+        task_type="summarization"
+    )
+
+def _load_for_enrichment(article_id: int) -> Optional[dict]:
+    """
+    Copy whatever the cluster representative already has onto the article (committed right
+    away) and return the article's text and remaining empty fields, or None if it is gone
+    """
+    db = SessionLocal()
+    try:
+        article = db.query(NewsArticle).filter(NewsArticle.id == article_id).first()
+        if article is None:
+            return None
+        rep = dedup.representative(db, article)
+        if rep is not None:
+            copied = False
+            for field in ("summary", "translated_title", "translated_description"):
+                if not getattr(article, field) and getattr(rep, field):
+                    setattr(article, field, getattr(rep, field))
+                    copied = True
+            if copied:
+                db.commit()
+        return {
+            "title": article.title,
+            "description": article.description,
+            "missing": [field for field in ("summary", "translated_title", "translated_description")
+                        if not getattr(article, field)],
+        }
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def _save_enrichment(article_id: int, values: dict):
+    db = SessionLocal()
+    try:
+        db.execute(update(NewsArticle).where(NewsArticle.id == article_id).values(**values))
+        db.commit()
+    except Exception as db_error:
+        logger.error(f"Database error while processing article: {str(db_error)}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+async def process_article(article_id: int):
+    """
+    Fill in whichever of summary / translated title / translated description are missing.
+    The Groq calls are independent and run concurrently. Successful results are committed even
+    when another sub-task fails; the failure is then raised so the job is retried, and the
+    retry only redoes what is still missing. Near-duplicates copy whatever their cluster
+    representative already has instead of calling Groq. Database work runs in threads; only
+    the Groq calls are awaited on the event loop.
+    """
+    article = await asyncio.to_thread(_load_for_enrichment, article_id)
+    if article is None:
+        return
+
+    tasks = {}
+    if article["description"] and "summary" in article["missing"]:
+        tasks["summary"] = summarize_text(article["description"])
+    if article["title"] and "translated_title" in article["missing"]:
+        tasks["translated_title"] = translate_text(article["title"], ENRICHMENT_TARGET_LANG)
+    if article["description"] and "translated_description" in article["missing"]:
+        tasks["translated_description"] = translate_text(article["description"], ENRICHMENT_TARGET_LANG)
+    if not tasks:
+        return
+
+    results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+    errors, values = [], {}
+    for field, result in zip(tasks, results):
+        if isinstance(result, Exception):
+            errors.append(f"{field}: {str(result)}")
+        else:
+            values[field] = result
+
+    if values:
+        await asyncio.to_thread(_save_enrichment, article_id, values)
+    if errors:
+        raise EnrichmentError("; ".join(errors))
+
+def _load_for_translation(article_id: int, lang: str) -> Optional[dict]:
+    """
+    The article's text and, for a near-duplicate, its representative's translation;
+    None if the article is gone or already translated
+    """
+    db = SessionLocal()
+    try:
+        article = db.query(NewsArticle).filter(NewsArticle.id == article_id).first()
+        if article is None:
+            return None
+        existing = db.query(ArticleTranslation).filter(
+            ArticleTranslation.article_id == article.id,
+            ArticleTranslation.lang == lang
+        ).first()
+        if existing and existing.title and (existing.description or not article.description):
+            return None
+
+        rep = dedup.representative(db, article)
+        rep_translation = rep and db.query(ArticleTranslation).filter(
+            ArticleTranslation.article_id == rep.id,
+            ArticleTranslation.lang == lang
+        ).first()
+        if rep_translation and rep_translation.title:
+            reused = (rep_translation.title, rep_translation.description)
+        else:
+            reused = None
+        return {"title": article.title, "description": article.description, "reused": reused}
+    finally:
+        db.close()
+
+def _save_translation(article_id: int, lang: str, title: str, description: str):
+    db = SessionLocal()
+    try:
+        insert = dialect_insert(db)
+        stmt = insert(ArticleTranslation).values(
+            article_id=article_id, lang=lang, title=title, description=description, created_at=datetime.utcnow()
+        )
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["article_id", "lang"],
+            set_={"title": stmt.excluded.title, "description": stmt.excluded.description}
+        ))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+async def translate_article(article_id: int, lang: str):
+    """Store the title/description translation for one language in article_translations"""
+    article = await asyncio.to_thread(_load_for_translation, article_id, lang)
+    if article is None:
+        return
+    if article["reused"]:
+        title, description = article["reused"]
+    else:
+        title, description = await asyncio.gather(
+            translate_text(article["title"], lang),
+            translate_text(article["description"], lang)
+        )
+    await asyncio.to_thread(_save_translation, article_id, lang, title, description)
@@ -0,0 +1,302 @@
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import os
+import random
+import re
+import time
+from typing import AsyncIterator, Dict, Optional
+
+import httpx
+
+from backend.http_client import get_http_client, GROQ_API_URL
+from backend import metrics
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Lower value = served first. User-facing calls preempt background enrichment.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+# Per-model limits (Groq enforces limits per model)
+GROQ_RPM = int(os.getenv("GROQ_RPM", "30"))
+GROQ_TPM = int(os.getenv("GROQ_TPM", "6000"))
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "4"))
+GROQ_BACKOFF_BASE = float(os.getenv("GROQ_BACKOFF_BASE", "0.5"))
+GROQ_BACKOFF_MAX = float(os.getenv("GROQ_BACKOFF_MAX", "30"))
+GROQ_TIMEOUT = float(os.getenv("GROQ_TIMEOUT", "30"))
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_SCALE = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse Groq's reset durations such as '7.66s', '2m59.56s' or '120ms' into seconds"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_SCALE[unit] for amount, unit in parts)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff"""
+    return random.uniform(0, min(GROQ_BACKOFF_MAX, GROQ_BACKOFF_BASE * 2 ** attempt))
+
+
+class TokenBucket:
+    def __init__(self, capacity: float, per_minute: float):
+        self.capacity = capacity
+        self.rate = per_minute / 60.0
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` is available (0 if it is available now)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float):
+        self._refill()
+        self.tokens -= amount
+
+    def clamp(self, remaining: float):
+        """Never believe we have more budget than the server says we do"""
+        self._refill()
+        self.tokens = min(self.tokens, remaining)
+
+
+class _ModelScheduler:
+    """Grants request slots for one model in priority order, within its RPM/TPM budget"""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.requests = TokenBucket(GROQ_RPM, GROQ_RPM)
+        self.tokens = TokenBucket(GROQ_TPM, GROQ_TPM)
+        self.blocked_until = 0.0
+        self._waiters = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    async def acquire(self, est_tokens: int, priority: int):
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), est_tokens, future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        self._wakeup.set()
+        await future
+
+    def block(self, seconds: float):
+        """Pause every caller of this model (after a 429 / exhausted quota)"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def observe(self, headers: httpx.Headers):
+        remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+        if remaining_tokens is not None and remaining_tokens.isdigit():
+            self.tokens.clamp(float(remaining_tokens))
+        remaining_requests = headers.get("x-ratelimit-remaining-requests")
+        if remaining_requests == "0":
+            reset = parse_duration(headers.get("x-ratelimit-reset-requests"))
+            if reset:
+                self.block(reset)
+
+    async def _dispatch(self):
+        while self._waiters:
+            priority, seq, est_tokens, future = self._waiters[0]
+            if future.cancelled():
+                heapq.heappop(self._waiters)
+                continue
+            wait = max(
+                self.blocked_until - time.monotonic(),
+                self.requests.wait_time(1),
+                self.tokens.wait_time(est_tokens),
+            )
+            if wait > 0:
+                # A newly queued higher-priority waiter interrupts the wait
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self._waiters)
+            self.requests.consume(1)
+            self.tokens.consume(est_tokens)
+            future.set_result(None)
+
+    def stats(self) -> dict:
+        return {
+            "queued": len(self._waiters),
+            "request_budget": round(self.requests.tokens, 2),
+            "token_budget": round(self.tokens.tokens, 2),
+            "blocked_for": max(0.0, round(self.blocked_until - time.monotonic(), 2)),
+        }
+
+
+_schedulers: Dict[str, _ModelScheduler] = {}
+_stats = {"requests": 0, "retries": 0, "rate_limited": 0, "failures": 0}
+
+
+def _scheduler_for(model: str) -> _ModelScheduler:
+    if model not in _schedulers:
+        _schedulers[model] = _ModelScheduler(model)
+    return _schedulers[model]
+
+
+def estimate_request_tokens(data: dict) -> int:
+    prompt_chars = sum(len(m.get("content") or "") for m in data.get("messages", []))
+    return prompt_chars // 4 + int(data.get("max_tokens") or 0)
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    retry_after = parse_duration(response.headers.get("retry-after"))
+    if retry_after is not None:
+        return min(retry_after, GROQ_BACKOFF_MAX)
+    reset = parse_duration(response.headers.get("x-ratelimit-reset-tokens"))
+    if response.status_code == 429 and reset is not None:
+        return min(reset, GROQ_BACKOFF_MAX)
+    return backoff_delay(attempt)
+
+
+async def post_chat_completion(data: dict, headers: dict, priority: int = PRIORITY_INTERACTIVE) -> httpx.Response:
+    """
+    Send a chat completion through the per-model rate limiter. 429s and 5xx responses are
+    retried with jittered exponential backoff (honouring Retry-After); the last response is
+    returned if every attempt fails. Timeouts propagate as httpx.TimeoutException.
+    """
+    model = data["model"]
+    scheduler = _scheduler_for(model)
+    est_tokens = estimate_request_tokens(data)
+    client = get_http_client()
+
+    for attempt in range(GROQ_MAX_RETRIES + 1):
+        await scheduler.acquire(est_tokens, priority)
+        _stats["requests"] += 1
+        started = time.perf_counter()
+        try:
+            response = await client.post(GROQ_API_URL, headers=headers, json=data, timeout=GROQ_TIMEOUT)
+        except httpx.TransportError as e:
+            metrics.groq_request_duration.observe(time.perf_counter() - started, model, "error", "false")
+            if attempt == GROQ_MAX_RETRIES or isinstance(e, httpx.TimeoutException):
+                _stats["failures"] += 1
+                raise
+            _stats["retries"] += 1
+            await asyncio.sleep(backoff_delay(attempt))
+            continue
+
+        metrics.groq_request_duration.observe(
+            time.perf_counter() - started, model, str(response.status_code), "false"
+        )
+        scheduler.observe(response.headers)
+        if response.status_code == 200:
+            # Reconcile the token estimate with actual usage
+            usage = response.json().get("usage") or {}
+            metrics.record_groq_usage(model, usage)
+            if usage.get("total_tokens"):
+                scheduler.tokens.consume(usage["total_tokens"] - est_tokens)
+            return response
+
+        retryable = response.status_code == 429 or response.status_code >= 500
+        if not retryable or attempt == GROQ_MAX_RETRIES:
+            _stats["failures"] += 1
+            return response
+
+        delay = _retry_delay(response, attempt)
+        if response.status_code == 429:
+            _stats["rate_limited"] += 1
+            scheduler.block(delay)
+        _stats["retries"] += 1
+        logger.warning(f"Groq returned {response.status_code} for {model}, retrying in {delay:.2f}s")
+        await asyncio.sleep(delay)
+
+    return response
+
+
+class GroqStreamError(Exception):
+    def __init__(self, status_code: int, detail: str, retry_after: Optional[str] = None):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+async def stream_chat_completion(data: dict, headers: dict,
+                                 priority: int = PRIORITY_INTERACTIVE) -> AsyncIterator[str]:
+    """
+    Streaming (stream: true) chat completion through the same limiter. Yields content deltas.
+    Failed attempts are retried like post_chat_completion as long as nothing has been yielded;
+    otherwise GroqStreamError is raised.
+    """
+    data = {**data, "stream": True}
+    model = data["model"]
+    scheduler = _scheduler_for(model)
+    est_tokens = estimate_request_tokens(data)
+    client = get_http_client()
+
+    for attempt in range(GROQ_MAX_RETRIES + 1):
+        await scheduler.acquire(est_tokens, priority)
+        _stats["requests"] += 1
+        started = time.perf_counter()
+        async with client.stream("POST", GROQ_API_URL, headers=headers, json=data, timeout=GROQ_TIMEOUT) as response:
+            scheduler.observe(response.headers)
+            if response.status_code != 200:
+                metrics.groq_request_duration.observe(
+                    time.perf_counter() - started, model, str(response.status_code), "true"
+                )
+                body = (await response.aread()).decode("utf-8", errors="replace")
+                retryable = response.status_code == 429 or response.status_code >= 500
+                if not retryable or attempt == GROQ_MAX_RETRIES:
+                    _stats["failures"] += 1
+                    try:
+                        detail = json.loads(body).get("error", {}).get("message", body)
+                    except ValueError:
+                        detail = body
+                    raise GroqStreamError(response.status_code, detail, response.headers.get("retry-after"))
+                delay = _retry_delay(response, attempt)
+                if response.status_code == 429:
+                    _stats["rate_limited"] += 1
+                    scheduler.block(delay)
+                _stats["retries"] += 1
+                logger.warning(f"Groq returned {response.status_code} for {model}, retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                payload = line[len("data:"):].strip()
+                if payload == "[DONE]":
+                    break
+                chunk = json.loads(payload)
+                usage = (chunk.get("x_groq") or {}).get("usage") or chunk.get("usage")
+                if usage and usage.get("total_tokens"):
+                    metrics.record_groq_usage(model, usage)
+                    scheduler.tokens.consume(usage["total_tokens"] - est_tokens)
+                for choice in chunk.get("choices") or []:
+                    delta = (choice.get("delta") or {}).get("content")
+                    if delta:
+                        yield delta
+            metrics.groq_request_duration.observe(time.perf_counter() - started, model, "200", "true")
+            return
+
+
+def stats() -> dict:
+    return {**_stats, "models": {model: s.stats() for model, s in _schedulers.items()}}
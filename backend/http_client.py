@@ -0,0 +1,112 @@
+import httpx
+import os
+import logging
+from typing import Optional
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+GROQ_API_URL = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
+
+# Pool configuration (all overridable from the environment)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+HTTP_POOL_TIMEOUT = float(os.getenv("HTTP_POOL_TIMEOUT", "10"))
+
+_client: Optional[httpx.AsyncClient] = None
+_stats = {"requests": 0, "errors": 0}
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional `h2` package; fall back to HTTP/1.1 keep-alive without it"""
+    if os.getenv("HTTP_ENABLE_HTTP2", "true").lower() not in ("1", "true", "yes"):
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+async def _on_request(request: httpx.Request):
+    _stats["requests"] += 1
+
+
+async def _on_response(response: httpx.Response):
+    if response.status_code >= 400:
+        _stats["errors"] += 1
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Build the long-lived, connection-pooled client shared by all upstream calls"""
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(
+        connect=HTTP_CONNECT_TIMEOUT,
+        read=HTTP_READ_TIMEOUT,
+        write=HTTP_READ_TIMEOUT,
+        pool=HTTP_POOL_TIMEOUT,
+    )
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=timeout,
+        http2=_http2_available(),
+        event_hooks={"request": [_on_request], "response": [_on_response]},
+    )
+
+
+async def init_http_client():
+    """Create the shared client. Called from the FastAPI startup hook."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+        logger.info(f"Shared HTTP client started (http2={_http2_available()})")
+
+
+async def close_http_client():
+    """Close the shared client and release pooled connections. Called on shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        logger.info("Shared HTTP client closed")
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it lazily if startup has not run (e.g. scripts)"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+def pool_stats() -> dict:
+    """Connection pool statistics for the shared client"""
+    stats = {
+        "started": _client is not None and not _client.is_closed,
+        "http2": _http2_available(),
+        "max_connections": HTTP_MAX_CONNECTIONS,
+        "max_keepalive_connections": HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        "requests": _stats["requests"],
+        "errors": _stats["errors"],
+        "connections": 0,
+        "idle_connections": 0,
+        "active_connections": 0,
+    }
+    if not stats["started"]:
+        return stats
+
+    # httpx does not expose pool state publicly; read it from the httpcore pool when present
+    pool = getattr(getattr(_client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+    stats["connections"] = len(connections)
+    stats["idle_connections"] = sum(1 for conn in connections if conn.is_idle())
+    stats["active_connections"] = stats["connections"] - stats["idle_connections"]
+    return stats
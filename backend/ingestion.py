@@ -0,0 +1,239 @@
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import literal, select
+from sqlalchemy.orm import Session
+
+from backend.database import SessionLocal, dialect_insert
+from backend.enrichment import parse_datetime
+from backend import dedup, jobs, response_cache
+from backend.models import ArticleCategory, NewsArticle
+from backend.newsapi_client import get_newsapi_client, VALID_CATEGORIES
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+INGESTION_ENABLED = os.getenv("INGESTION_ENABLED", "true").lower() in ("1", "true", "yes")
+INGESTION_INTERVAL_SECONDS = int(os.getenv("INGESTION_INTERVAL_SECONDS", "600"))
+# Wait before the first pass so a cold-started process answers its first requests (and
+# validates the NewsAPI key) without competing with a full ingestion run
+INGESTION_INITIAL_DELAY_SECONDS = float(os.getenv("INGESTION_INITIAL_DELAY_SECONDS", "0"))
+INGESTION_PAGE_SIZE = int(os.getenv("INGESTION_PAGE_SIZE", "20"))
+INGESTION_PAGES = int(os.getenv("INGESTION_PAGES", "1"))
+INGESTION_COUNTRY = os.getenv("INGESTION_COUNTRY", "us")
+INGESTION_LANGUAGE = os.getenv("INGESTION_LANGUAGE", "en")
+
+# "general" backs /latest; the rest back /category/{category}
+INGESTION_CATEGORIES = ["general"] + [c for c in VALID_CATEGORIES if c != "general"]
+
+# category -> {"last_attempt", "last_success", "articles", "new_articles", "error"}
+_freshness: dict = {}
+_scheduler_task: Optional[asyncio.Task] = None
+_category_locks: dict = {}
+
+
+class NewsSourceUnavailable(Exception):
+    """Raised when NewsAPI is not configured or the key failed validation"""
+
+
+def bulk_upsert_articles(db: Session, articles_data: List[dict], category: str) -> Tuple[List[int], List[int]]:
+    """
+    Store a batch of NewsAPI headlines in two statements: one IN query to resolve URLs that
+    already exist and one INSERT ... ON CONFLICT(url) DO NOTHING RETURNING id for the rest.
+    Returns (ids of every article in the batch in input order, ids of newly inserted articles).
+    """
+    rows = {}
+    for article_data in articles_data:
+        if not all([article_data.get('title'), article_data.get('url')]):
+            logger.warning(f"Skipping article with missing title or URL: {article_data}")
+            continue
+        if article_data['url'] in rows:
+            continue
+        rows[article_data['url']] = {
+            "title": article_data['title'],
+            "description": article_data.get('description') or "No description available",
+            "url": article_data['url'],
+            "image_url": article_data.get('urlToImage'),
+            "published_at": parse_datetime(article_data.get('publishedAt')),
+            "source": (article_data.get('source') or {}).get('name') or 'Unknown',
+            "category": category,
+        }
+    if not rows:
+        return [], []
+
+    ids_by_url = dict(
+        db.query(NewsArticle.url, NewsArticle.id).filter(NewsArticle.url.in_(list(rows))).all()
+    )
+
+    new_ids = []
+    pending = [row for url, row in rows.items() if url not in ids_by_url]
+    if pending:
+        insert = dialect_insert(db)
+        stmt = insert(NewsArticle).values(pending).on_conflict_do_nothing(
+            index_elements=["url"]
+        ).returning(NewsArticle.id, NewsArticle.url)
+        for article_id, url in db.execute(stmt).all():
+            ids_by_url[url] = article_id
+            new_ids.append(article_id)
+    db.commit()
+
+    all_ids = [ids_by_url[url] for url in rows if url in ids_by_url]
+    return all_ids, new_ids
+
+
+def link_category(db: Session, article_ids: List[int], category: str) -> List[int]:
+    """
+    List the articles in a category feed. An article already stored under another category
+    (the same story in "general" and "business") gets a second link rather than being dropped.
+    Returns the ids that were not linked to the category before. Does not commit.
+    """
+    if not article_ids:
+        return []
+    insert = dialect_insert(db)
+    stmt = insert(ArticleCategory).from_select(
+        ["article_id", "category", "published_at"],
+        select(NewsArticle.id, literal(category), NewsArticle.published_at).where(NewsArticle.id.in_(article_ids))
+    ).on_conflict_do_nothing(index_elements=["article_id", "category"]).returning(ArticleCategory.article_id)
+    return [article_id for (article_id,) in db.execute(stmt).all()]
+
+
+def _store_batch(articles_data: List[dict], category: str) -> Tuple[List[int], List[int]]:
+    """
+    Upsert, link, cluster and queue jobs for one fetched batch in a single session (runs in a
+    thread). Returns (ids of new articles, ids newly listed in the category).
+    """
+    db = SessionLocal()
+    try:
+        all_ids, new_ids = bulk_upsert_articles(db, articles_data, category)
+        linked_ids = link_category(db, all_ids, category)
+        clusters = dedup.assign_clusters(db, new_ids)
+        # Summaries and translations are produced by the durable job workers. Near-duplicates
+        # run later and reuse their cluster representative's output when it is ready.
+        leaders = [i for i in new_ids if clusters.get(i, i) == i]
+        followers = [i for i in new_ids if clusters.get(i, i) != i]
+        jobs.enqueue(db, leaders)
+        jobs.enqueue_translations(db, leaders)
+        jobs.enqueue(db, followers, delay_seconds=dedup.DEDUP_FOLLOWER_DELAY_SECONDS)
+        jobs.enqueue_translations(db, followers, delay_seconds=dedup.DEDUP_FOLLOWER_DELAY_SECONDS)
+        db.commit()
+        return new_ids, linked_ids
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def ingest_category(category: str) -> int:
+    """Fetch the top headlines for one category and write them to the articles table"""
+    lock = _category_locks.setdefault(category, asyncio.Lock())
+    async with lock:
+        state = _freshness.setdefault(category, {})
+        state["last_attempt"] = datetime.utcnow()
+
+        newsapi = await get_newsapi_client()
+        if not newsapi:
+            state["error"] = "NEWS_API_KEY not configured"
+            raise NewsSourceUnavailable("NEWS_API_KEY not configured")
+
+        try:
+            # Pages are fetched concurrently; the client's semaphore bounds the fan-out
+            responses = await asyncio.gather(*(
+                newsapi.get_top_headlines(
+                    category=None if category == "general" else category,
+                    country=INGESTION_COUNTRY,
+                    language=INGESTION_LANGUAGE,
+                    page_size=INGESTION_PAGE_SIZE,
+                    page=page if INGESTION_PAGES > 1 else None
+                )
+                for page in range(1, INGESTION_PAGES + 1)
+            ))
+            articles_data = [a for response in responses for a in (response.get('articles') or [])]
+
+            new_ids, linked_ids = await asyncio.to_thread(_store_batch, articles_data, category)
+        except Exception as e:
+            state["error"] = str(e)
+            raise
+
+        if linked_ids:
+            # Cached feed responses no longer reflect the table
+            response_cache.invalidate()
+        state.update({
+            "last_success": datetime.utcnow(),
+            "articles": len(articles_data),
+            "new_articles": len(new_ids),
+            "error": None,
+        })
+        logger.info(f"Ingested {len(new_ids)} new articles for category '{category}'")
+        return len(new_ids)
+
+
+async def ingest_all():
+    """One refresh pass over every category, fanned out concurrently"""
+    results = await asyncio.gather(
+        *(ingest_category(category) for category in INGESTION_CATEGORIES),
+        return_exceptions=True
+    )
+    for category, result in zip(INGESTION_CATEGORIES, results):
+        if isinstance(result, Exception):
+            logger.error(f"Ingestion failed for category '{category}': {str(result)}")
+
+
+async def _run_scheduler():
+    if INGESTION_INITIAL_DELAY_SECONDS:
+        await asyncio.sleep(INGESTION_INITIAL_DELAY_SECONDS)
+    while True:
+        await ingest_all()
+        await asyncio.sleep(INGESTION_INTERVAL_SECONDS)
+
+
+def start_scheduler():
+    """Start the periodic ingestion loop. Called from the FastAPI startup hook."""
+    global _scheduler_task
+    if not INGESTION_ENABLED:
+        logger.info("Background ingestion disabled (INGESTION_ENABLED=false)")
+        return
+    if _scheduler_task is None or _scheduler_task.done():
+        _scheduler_task = asyncio.create_task(_run_scheduler())
+        logger.info(f"Background ingestion started, interval {INGESTION_INTERVAL_SECONDS}s")
+
+
+async def stop_scheduler():
+    global _scheduler_task
+    if _scheduler_task is not None:
+        _scheduler_task.cancel()
+        try:
+            await _scheduler_task
+        except asyncio.CancelledError:
+            pass
+        _scheduler_task = None
+
+
+def has_been_ingested(category: str) -> bool:
+    return _freshness.get(category, {}).get("last_success") is not None
+
+
+def freshness() -> dict:
+    """Per-category freshness timestamps"""
+    now = datetime.utcnow()
+    result = {}
+    for category in INGESTION_CATEGORIES:
+        state = _freshness.get(category, {})
+        last_success = state.get("last_success")
+        result[category] = {
+            "last_attempt": state.get("last_attempt"),
+            "last_success": last_success,
+            "age_seconds": int((now - last_success).total_seconds()) if last_success else None,
+            "articles": state.get("articles"),
+            "new_articles": state.get("new_articles"),
+            "error": state.get("error"),
+        }
+    return {
+        "interval_seconds": INGESTION_INTERVAL_SECONDS,
+        "scheduler_running": _scheduler_task is not None and not _scheduler_task.done(),
+        "categories": result,
+    }
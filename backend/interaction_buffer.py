@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from backend.database import SessionLocal
+from backend.models import UserInteraction
+from backend import recommendations
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Flush every INTERACTION_FLUSH_SIZE events or INTERACTION_FLUSH_INTERVAL_MS, whichever comes first
+INTERACTION_FLUSH_SIZE = int(os.getenv("INTERACTION_FLUSH_SIZE", "200"))
+INTERACTION_FLUSH_INTERVAL_MS = int(os.getenv("INTERACTION_FLUSH_INTERVAL_MS", "500"))
+INTERACTION_QUEUE_MAX = int(os.getenv("INTERACTION_QUEUE_MAX", "10000"))
+# How long a request may wait for queue space before it gets a 503
+INTERACTION_ENQUEUE_TIMEOUT = float(os.getenv("INTERACTION_ENQUEUE_TIMEOUT", "0.5"))
+
+INTERACTION_WEIGHTS = {"view": 1.0, "click": 2.0}
+# How often a waiting submit() re-checks for room for its whole batch
+_RESERVE_POLL_SECONDS = 0.01
+
+_queue: Optional[asyncio.Queue] = None
+_flusher: Optional[asyncio.Task] = None
+_stats = {"accepted": 0, "rejected": 0, "flushed": 0, "batches": 0, "failed": 0}
+
+
+class BufferFull(Exception):
+    """Raised when the buffer stays full for INTERACTION_ENQUEUE_TIMEOUT seconds"""
+
+
+def _get_queue() -> asyncio.Queue:
+    global _queue
+    if _queue is None:
+        _queue = asyncio.Queue(maxsize=INTERACTION_QUEUE_MAX)
+    return _queue
+
+
+async def submit(events: List[dict]):
+    """
+    Queue interaction events for the next batched write; applies backpressure when full.
+    All or nothing: events are queued only once there is room for the whole batch, so a
+    client retrying after a 503 doesn't count the first part twice.
+    """
+    queue = _get_queue()
+    deadline = time.monotonic() + INTERACTION_ENQUEUE_TIMEOUT
+    # The check and the puts below run without yielding, so the space can't be taken meanwhile
+    while queue.maxsize - queue.qsize() < len(events):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or len(events) > queue.maxsize:
+            _stats["rejected"] += 1
+            raise BufferFull("Interaction buffer is full")
+        await asyncio.sleep(min(_RESERVE_POLL_SECONDS, remaining))
+
+    now = datetime.utcnow()
+    for event in events:
+        queue.put_nowait({
+            "article_id": event["article_id"],
+            "interaction_type": event["interaction_type"],
+            "user_id": event.get("user_id"),
+            "timestamp": now,
+            "interaction_weight": INTERACTION_WEIGHTS.get(event["interaction_type"], 2.0),
+        })
+    _stats["accepted"] += len(events)
+
+
+def _write_batch(rows: List[dict]):
+    """Persist a batch of interactions and their profile updates in one transaction"""
+    db = SessionLocal()
+    try:
+        interactions = [UserInteraction(**row) for row in rows]
+        db.add_all(interactions)
+        recommendations.update_profiles(db, interactions)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def _flush(rows: List[dict]):
+    if not rows:
+        return
+    try:
+        await asyncio.to_thread(_write_batch, rows)
+        _stats["flushed"] += len(rows)
+        _stats["batches"] += 1
+    except Exception as e:
+        _stats["failed"] += len(rows)
+        logger.error(f"Failed to flush {len(rows)} interactions: {str(e)}")
+
+
+_STOP = object()
+
+
+async def _collect_batch(queue: asyncio.Queue) -> tuple:
+    """
+    Wait for the first event, then gather more until the batch is full or the interval ends.
+    Returns (rows, stop_requested).
+    """
+    first = await queue.get()
+    if first is _STOP:
+        return [], True
+    rows = [first]
+    deadline = time.monotonic() + INTERACTION_FLUSH_INTERVAL_MS / 1000
+    while len(rows) < INTERACTION_FLUSH_SIZE:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            row = await asyncio.wait_for(queue.get(), timeout=remaining)
+        except asyncio.TimeoutError:
+            break
+        if row is _STOP:
+            return rows, True
+        rows.append(row)
+    return rows, False
+
+
+async def _run_flusher():
+    queue = _get_queue()
+    while True:
+        rows, stop_requested = await _collect_batch(queue)
+        await _flush(rows)
+        if stop_requested:
+            break
+
+    # Shutdown: anything enqueued after the stop marker is written out too
+    rows = []
+    while not queue.empty():
+        row = queue.get_nowait()
+        if row is not _STOP:
+            rows.append(row)
+    for i in range(0, len(rows), INTERACTION_FLUSH_SIZE):
+        await _flush(rows[i:i + INTERACTION_FLUSH_SIZE])
+    if rows:
+        logger.info(f"Flushed {len(rows)} buffered interactions on shutdown")
+
+
+def start():
+    """Start the background flusher. Called from the FastAPI startup hook."""
+    global _flusher
+    if _flusher is None or _flusher.done():
+        _flusher = asyncio.create_task(_run_flusher())
+
+
+async def stop():
+    """Stop the flusher after everything still buffered has been written"""
+    global _flusher
+    if _flusher is None:
+        return
+    # The flusher keeps draining, so this only waits while a full buffer is written out
+    await _get_queue().put(_STOP)
+    await _flusher
+    _flusher = None
+
+
+def stats() -> dict:
+    return {**_stats, "queued": _get_queue().qsize(), "capacity": INTERACTION_QUEUE_MAX}
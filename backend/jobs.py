@@ -0,0 +1,298 @@
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func, or_, and_, select, update
+from sqlalchemy.orm import Session
+
+from backend.database import SessionLocal, dialect_insert
+from backend.enrichment import process_article, translate_article, HOT_LANGUAGES
+from backend.models import EnrichmentJob
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "3"))
+# Renewed while a job runs (see _keep_leased); expires only when the worker is gone
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "180"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "2"))
+JOB_RETRY_BASE_SECONDS = int(os.getenv("JOB_RETRY_BASE_SECONDS", "30"))
+# Translations requested by feed reads and not yet written to the queue; beyond this many,
+# requests are dropped (the next read of the article asks again)
+JOB_REQUESTS_MAX = int(os.getenv("JOB_REQUESTS_MAX", "10000"))
+
+_workers: List[asyncio.Task] = []
+_wakeup: Optional[asyncio.Event] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_requested: Set[Tuple[int, str]] = set()
+_stats = {"claimed": 0, "completed": 0, "retried": 0, "failed": 0}
+
+
+def enqueue(db: Session, article_ids: Iterable[int], kind: str = "enrich", delay_seconds: int = 0):
+    """
+    Queue jobs for articles. Idempotent: an existing (article_id, kind) job is left alone.
+    Does not commit, so jobs can be written in the same transaction as the articles.
+    """
+    available_at = datetime.utcnow() + timedelta(seconds=delay_seconds)
+    rows = [{"article_id": article_id, "kind": kind, "status": "queued", "attempts": 0,
+             "available_at": available_at, "created_at": datetime.utcnow()}
+            for article_id in article_ids]
+    if not rows:
+        return
+    insert = dialect_insert(db)
+    db.execute(insert(EnrichmentJob).values(rows).on_conflict_do_nothing(
+        index_elements=["article_id", "kind"]
+    ))
+    _wake()
+
+
+def _wake():
+    """Wake idle workers; enqueue is also called from asyncio.to_thread helpers"""
+    if _wakeup is None:
+        return
+    try:
+        on_loop = asyncio.get_running_loop() is _loop
+    except RuntimeError:
+        on_loop = False
+    if on_loop:
+        _wakeup.set()
+    else:
+        try:
+            _loop.call_soon_threadsafe(_wakeup.set)
+        except RuntimeError:
+            # Loop already closed (shutdown)
+            pass
+
+
+def enqueue_translations(db: Session, article_ids: Iterable[int], languages: Iterable[str] = None,
+                         delay_seconds: int = 0):
+    """Queue per-language translation jobs (HOT_LANGUAGES by default)"""
+    article_ids = list(article_ids)
+    for lang in (HOT_LANGUAGES if languages is None else languages):
+        enqueue(db, article_ids, kind=f"translate:{lang}", delay_seconds=delay_seconds)
+
+
+def request_translations(article_ids: Iterable[int], lang: str):
+    """
+    Ask for translations from a request handler without writing to the database: the ids are
+    kept in memory and queued by the next idle worker
+    """
+    for article_id in article_ids:
+        if len(_requested) >= JOB_REQUESTS_MAX:
+            break
+        _requested.add((article_id, lang))
+    _wake()
+
+
+def _enqueue_requested(requested: List[Tuple[int, str]]):
+    by_lang = {}
+    for article_id, lang in requested:
+        by_lang.setdefault(lang, []).append(article_id)
+    db = SessionLocal()
+    try:
+        for lang, article_ids in by_lang.items():
+            enqueue(db, article_ids, kind=f"translate:{lang}")
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _claim() -> Optional[tuple]:
+    """
+    Atomically lease the next runnable job: queued and due, or running with an expired lease
+    (its worker died). Returns (id, article_id, kind, attempts) or None.
+    """
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        candidate = select(EnrichmentJob.id).where(or_(
+            and_(EnrichmentJob.status == "queued", EnrichmentJob.available_at <= now),
+            and_(EnrichmentJob.status == "running", EnrichmentJob.lease_expires_at < now),
+        )).order_by(EnrichmentJob.available_at).limit(1)
+        if db.bind.dialect.name == "postgresql":
+            candidate = candidate.with_for_update(skip_locked=True)
+
+        claimed = db.execute(
+            update(EnrichmentJob)
+            .where(EnrichmentJob.id == candidate.scalar_subquery())
+            .values(
+                status="running",
+                attempts=EnrichmentJob.attempts + 1,
+                lease_expires_at=now + timedelta(seconds=JOB_LEASE_SECONDS),
+            )
+            .returning(EnrichmentJob.id, EnrichmentJob.article_id, EnrichmentJob.kind, EnrichmentJob.attempts)
+        ).first()
+        db.commit()
+        return tuple(claimed) if claimed else None
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _finish(job_id: int, error: Optional[str], attempts: int):
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        if error is None:
+            values = {"status": "done", "completed_at": now, "last_error": None, "lease_expires_at": None}
+        elif attempts >= JOB_MAX_ATTEMPTS:
+            values = {"status": "failed", "completed_at": now, "last_error": error, "lease_expires_at": None}
+        else:
+            backoff = JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+            values = {"status": "queued", "last_error": error, "lease_expires_at": None,
+                      "available_at": now + timedelta(seconds=backoff)}
+        db.execute(update(EnrichmentJob).where(EnrichmentJob.id == job_id).values(**values))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _renew_lease(job_id: int, attempts: int):
+    """Push the lease forward, unless the job was reclaimed meanwhile (attempts moved on)"""
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(EnrichmentJob)
+            .where(EnrichmentJob.id == job_id, EnrichmentJob.status == "running",
+                   EnrichmentJob.attempts == attempts)
+            .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=JOB_LEASE_SECONDS))
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _keep_leased(job_id: int, attempts: int):
+    """
+    Renew the lease every third of JOB_LEASE_SECONDS while the job runs, so Groq retries
+    and backoff (which can outlast one lease) don't let another worker reclaim it
+    """
+    while True:
+        await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+        try:
+            await asyncio.to_thread(_renew_lease, job_id, attempts)
+        except Exception as e:
+            logger.warning(f"Failed to renew lease of job {job_id}: {str(e)}")
+
+
+async def run_job(article_id: int, kind: str):
+    """Execute one job; database work happens in threads, Groq calls on the loop"""
+    if kind == "enrich":
+        await process_article(article_id)
+    elif kind.startswith("translate:"):
+        await translate_article(article_id, kind.split(":", 1)[1])
+    else:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+
+async def _worker(name: str):
+    while True:
+        if _requested:
+            requested = list(_requested)
+            _requested.clear()
+            try:
+                await asyncio.to_thread(_enqueue_requested, requested)
+            except Exception as e:
+                logger.error(f"{name}: failed to queue requested translations: {str(e)}")
+
+        try:
+            job = await asyncio.to_thread(_claim)
+        except Exception as e:
+            logger.error(f"{name}: failed to claim job: {str(e)}")
+            job = None
+
+        if job is None:
+            _wakeup.clear()
+            try:
+                await asyncio.wait_for(_wakeup.wait(), timeout=JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        job_id, article_id, kind, attempts = job
+        _stats["claimed"] += 1
+        if attempts > JOB_MAX_ATTEMPTS:
+            # Reclaimed after its lease expired once too often (e.g. it keeps crashing the worker)
+            await asyncio.to_thread(_finish, job_id, "lease expired too many times", attempts)
+            _stats["failed"] += 1
+            continue
+
+        error = None
+        heartbeat = asyncio.create_task(_keep_leased(job_id, attempts))
+        try:
+            await run_job(article_id, kind)
+        except asyncio.CancelledError:
+            # Shutdown: the lease expires and the job is picked up again after restart
+            raise
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+            logger.warning(f"Job {job_id} ({kind} article {article_id}) attempt {attempts} failed: {error}")
+        finally:
+            heartbeat.cancel()
+
+        await asyncio.to_thread(_finish, job_id, error, attempts)
+        if error is None:
+            _stats["completed"] += 1
+        elif attempts >= JOB_MAX_ATTEMPTS:
+            _stats["failed"] += 1
+        else:
+            _stats["retried"] += 1
+
+
+def start_workers():
+    """Start the worker pool. Called from the FastAPI startup hook."""
+    global _wakeup, _loop
+    _wakeup = asyncio.Event()
+    _loop = asyncio.get_running_loop()
+    if any(not worker.done() for worker in _workers):
+        return
+    _workers.clear()
+    prefix = uuid.uuid4().hex[:6]
+    for i in range(JOB_WORKERS):
+        _workers.append(asyncio.create_task(_worker(f"worker-{prefix}-{i}")))
+    logger.info(f"Started {JOB_WORKERS} enrichment workers")
+
+
+async def stop_workers():
+    for worker in _workers:
+        worker.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+
+
+def stats() -> dict:
+    """Queue depth by status and recent throughput"""
+    db = SessionLocal()
+    try:
+        depth = dict(
+            db.query(EnrichmentJob.status, func.count(EnrichmentJob.id)).group_by(EnrichmentJob.status).all()
+        )
+        now = datetime.utcnow()
+        completed_last_minute = db.query(func.count(EnrichmentJob.id)).filter(
+            EnrichmentJob.status == "done",
+            EnrichmentJob.completed_at >= now - timedelta(minutes=1)
+        ).scalar()
+        completed_last_hour = db.query(func.count(EnrichmentJob.id)).filter(
+            EnrichmentJob.status == "done",
+            EnrichmentJob.completed_at >= now - timedelta(hours=1)
+        ).scalar()
+    finally:
+        db.close()
+    return {
+        "workers": len([w for w in _workers if not w.done()]),
+        "depth": depth,
+        "completed_last_minute": completed_last_minute,
+        "completed_last_hour": completed_last_hour,
+        "requested": len(_requested),
+        **_stats,
+    }
@@ -0,0 +1,21 @@
+# Languages offered in the frontend selector, by code (English is the source language)
+LANGUAGE_NAMES = {
+    'ar': 'Modern Standard Arabic',
+    'bn': 'Standard Bengali',
+    'zh': 'Simplified Chinese',
+    'fr': 'French',
+    'de': 'German',
+    'hi': 'Hindi',
+    'id': 'Indonesian',
+    'it': 'Italian',
+    'ja': 'Japanese',
+    'ko': 'Korean',
+    'pt': 'Portuguese',
+    'ru': 'Russian',
+    'es': 'Spanish',
+    'tr': 'Turkish'
+}
+
+
+def is_supported(lang: str) -> bool:
+    return (lang or "").lower() in LANGUAGE_NAMES
@@ -0,0 +1,175 @@
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+
+from backend.database import SessionLocal
+from backend.models import LLMCacheEntry
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MEMORY_ITEMS = int(os.getenv("LLM_CACHE_MEMORY_ITEMS", "2048"))
+LLM_CACHE_MAX_ROWS = int(os.getenv("LLM_CACHE_MAX_ROWS", "50000"))
+LLM_CACHE_PRUNE_EVERY = int(os.getenv("LLM_CACHE_PRUNE_EVERY", "500"))
+
+# In-process LRU tier: key -> (value, expires_at)
+_memory: "OrderedDict[str, tuple]" = OrderedDict()
+_lock = threading.Lock()
+_writes_since_prune = 0
+_stats = {"memory_hits": 0, "db_hits": 0, "misses": 0, "writes": 0}
+
+
+def normalize_text(text: str) -> str:
+    """
+    Collapse whitespace so trivially different inputs share a cache entry. Case is kept: it
+    changes the meaning of some inputs (acronyms, proper nouns) and so the model's output.
+    """
+    return " ".join((text or "").split())
+
+
+def make_key(text: str, task: str, target_lang: Optional[str] = None,
+             model: Optional[str] = None, max_length: Optional[int] = None) -> str:
+    """Content-addressed cache key for an LLM task"""
+    text_hash = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    parts = [text_hash, task, (target_lang or "").lower(), model or "", str(max_length or "")]
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def _remember(key: str, value: str, expires_at: datetime):
+    with _lock:
+        _memory[key] = (value, expires_at)
+        _memory.move_to_end(key)
+        while len(_memory) > LLM_CACHE_MEMORY_ITEMS:
+            _memory.popitem(last=False)
+
+
+def _memory_lookup(key: str) -> Optional[str]:
+    now = datetime.utcnow()
+    with _lock:
+        entry = _memory.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at > now:
+                _memory.move_to_end(key)
+                _stats["memory_hits"] += 1
+                return value
+            del _memory[key]
+    return None
+
+
+def _db_lookup(key: str) -> Optional[str]:
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        row = db.query(LLMCacheEntry).filter(LLMCacheEntry.key == key).first()
+        if row is None or row.expires_at <= now:
+            _stats["misses"] += 1
+            return None
+        row.last_accessed = now
+        db.commit()
+        _stats["db_hits"] += 1
+        _remember(key, row.value, row.expires_at)
+        return row.value
+    except Exception as e:
+        logger.error(f"LLM cache lookup failed: {str(e)}")
+        db.rollback()
+        return None
+    finally:
+        db.close()
+
+
+async def lookup(key: str) -> Optional[str]:
+    """
+    Look up a cached completion, checking the LRU tier before SQLite. LRU hits return
+    directly; SQLite is read in a thread so callers on the event loop don't block.
+    """
+    if not LLM_CACHE_ENABLED or not key:
+        return None
+    value = _memory_lookup(key)
+    if value is not None:
+        return value
+    return await asyncio.to_thread(_db_lookup, key)
+
+
+def _db_store(key: str, value: str, task: Optional[str], model: Optional[str],
+              now: datetime, expires_at: datetime):
+    global _writes_since_prune
+    db = SessionLocal()
+    try:
+        db.merge(LLMCacheEntry(
+            key=key,
+            task=task,
+            model=model,
+            value=value,
+            created_at=now,
+            expires_at=expires_at,
+            last_accessed=now
+        ))
+        db.commit()
+        _stats["writes"] += 1
+        with _lock:
+            _writes_since_prune += 1
+            due = _writes_since_prune >= LLM_CACHE_PRUNE_EVERY
+            if due:
+                _writes_since_prune = 0
+        if due:
+            prune(db)
+    except Exception as e:
+        logger.error(f"LLM cache write failed: {str(e)}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+async def store(key: str, value: str, task: str = None, model: str = None):
+    """Store a successful completion in both tiers; the SQLite write runs in a thread"""
+    if not LLM_CACHE_ENABLED or not key or not value:
+        return
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=LLM_CACHE_TTL_SECONDS)
+    _remember(key, value, expires_at)
+    await asyncio.to_thread(_db_store, key, value, task, model, now, expires_at)
+
+
+def prune(db=None):
+    """Drop expired rows and trim the table to LLM_CACHE_MAX_ROWS, least recently used first"""
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        db.query(LLMCacheEntry).filter(
+            LLMCacheEntry.expires_at <= datetime.utcnow()
+        ).delete(synchronize_session=False)
+
+        overflow = db.query(LLMCacheEntry).count() - LLM_CACHE_MAX_ROWS
+        if overflow > 0:
+            stale_keys = db.query(LLMCacheEntry.key).order_by(
+                LLMCacheEntry.last_accessed.asc()
+            ).limit(overflow).subquery()
+            db.query(LLMCacheEntry).filter(
+                LLMCacheEntry.key.in_(stale_keys.select())
+            ).delete(synchronize_session=False)
+        db.commit()
+    except Exception as e:
+        logger.error(f"LLM cache prune failed: {str(e)}")
+        db.rollback()
+    finally:
+        if own_session:
+            db.close()
+
+
+def stats() -> dict:
+    lookups = _stats["memory_hits"] + _stats["db_hits"] + _stats["misses"]
+    hits = _stats["memory_hits"] + _stats["db_hits"]
+    return {
+        **_stats,
+        "memory_items": len(_memory),
+        "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+    }
@@ -1,16 +1,73 @@
 from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 from backend.routes import news, auth, summarization
-from backend.database import Base, engine
+from backend.database import SessionLocal, engine, async_engine
+from backend.http_client import init_http_client, close_http_client, pool_stats
+from backend import llm_cache, newsapi_client
+from backend import ingestion, interaction_buffer, tts, groq_scheduler, jobs, dedup, storage, response_cache, metrics, passwords, coldstart
 import os
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+coldstart.mark("imports")
+
+# Create database tables, indexes and the search index (skipped when the schema version matches)
+coldstart.prepare_schema(engine)
+coldstart.mark("schema")
 
 app = FastAPI(title="News Summarizer API")
 
+metrics.instrument_engine(engine)
+metrics.instrument_engine(async_engine.sync_engine)
+
+def cache_metrics():
+    """Hit/miss counters of every cache, read from their stats() at scrape time"""
+    llm = llm_cache.stats()
+    responses = response_cache.stats()
+    speech = tts.stats()
+    samples = [
+        ({"cache": "llm", "result": "memory_hit"}, llm["memory_hits"]),
+        ({"cache": "llm", "result": "db_hit"}, llm["db_hits"]),
+        ({"cache": "llm", "result": "miss"}, llm["misses"]),
+        ({"cache": "response", "result": "hit"}, responses["hits"]),
+        ({"cache": "response", "result": "miss"}, responses["misses"]),
+        ({"cache": "tts", "result": "hit"}, speech["hits"]),
+        ({"cache": "tts", "result": "miss"}, speech["misses"]),
+    ]
+    yield "cache_requests_total", "Cache lookups by result", "counter", samples
+    ratios = {}
+    for labels, value in samples:
+        hits, total = ratios.get(labels["cache"], (0, 0))
+        ratios[labels["cache"]] = (hits + (value if "hit" in labels["result"] else 0), total + value)
+    yield "cache_hit_ratio", "Share of lookups served from cache since start", "gauge", [
+        ({"cache": cache}, round(hits / total, 4) if total else 0.0) for cache, (hits, total) in ratios.items()
+    ]
+    # 304s are a subset of the response cache's hits and misses, so they are counted separately
+    yield "response_cache_not_modified_total", "Feed responses answered 304 Not Modified", "counter", [
+        ({}, responses["not_modified"])
+    ]
+    yield "response_cache_entries", "Cached feed responses", "gauge", [({}, responses["entries"])]
+
+metrics.register_collector(cache_metrics)
+metrics.register_collector(coldstart.collect)
+
+@app.on_event("startup")
+async def startup():
+    await init_http_client()
+    jobs.start_workers()
+    ingestion.start_scheduler()
+    interaction_buffer.start()
+    coldstart.mark("app_ready")
+
+@app.on_event("shutdown")
+async def shutdown():
+    await ingestion.stop_scheduler()
+    await interaction_buffer.stop()
+    await jobs.stop_workers()
+    await close_http_client()
+    # Pooled aiosqlite connections each own a thread; close them so the process can exit
+    await async_engine.dispose()
+
 # Configure CORS
 origins = [
     "http://localhost:3000",
@@ -21,6 +78,10 @@ origins = [
     "http://127.0.0.1:8000",
 ]
 
+# Feed response cache (ETag/304, gzip/brotli, Cache-Control). Added before CORS so the CORS
+# middleware wraps it and cached responses still get CORS headers.
+app.add_middleware(response_cache.ResponseCacheMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Allow all origins for development
@@ -29,6 +90,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so latency includes the cache and CORS layers
+app.add_middleware(metrics.MetricsMiddleware)
+
+# Time to first response, for the startup budget
+app.add_middleware(coldstart.FirstResponseMiddleware)
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="frontend_file/static"), name="static")
 
@@ -51,11 +118,80 @@ def debug_env():
 async def root():
     return FileResponse("frontend_file/index.html")
 
+# Prometheus scrape endpoint
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 # Health check route
 @app.get("/api/health")
 async def health_check():
     return {"status": "healthy"}
 
+# Shared upstream HTTP connection pool stats
+@app.get("/api/health/http-pool")
+async def http_pool_stats():
+    return pool_stats()
+
+# LLM summary/translation cache stats
+@app.get("/api/health/llm-cache")
+async def llm_cache_stats():
+    return llm_cache.stats()
+
+# Whether the NewsAPI key has been validated
+@app.get("/api/health/newsapi")
+async def newsapi_stats():
+    return newsapi_client.stats()
+
+# Buffered interaction writer stats
+@app.get("/api/health/interactions")
+async def interaction_buffer_stats():
+    return interaction_buffer.stats()
+
+# Text-to-speech pool and disk cache stats
+@app.get("/api/health/tts")
+async def tts_stats():
+    return tts.stats()
+
+# Groq rate limiter state
+@app.get("/api/health/groq")
+async def groq_scheduler_stats():
+    return groq_scheduler.stats()
+
+# Enrichment job queue depth and throughput
+@app.get("/api/health/jobs")
+def job_stats():
+    return jobs.stats()
+
+# Feed response cache hit ratio
+@app.get("/api/health/response-cache")
+async def response_cache_stats():
+    return response_cache.stats()
+
+# Database pool and SQLite pragma settings
+@app.get("/api/health/db")
+def db_stats():
+    return storage.stats(engine)
+
+# Near-duplicate story clustering
+@app.get("/api/health/dedup")
+def dedup_stats():
+    db = SessionLocal()
+    try:
+        return dedup.stats(db)
+    finally:
+        db.close()
+
+# Password hashing pool and JWT claims cache
+@app.get("/api/health/auth")
+async def auth_stats():
+    return {**passwords.stats(), **auth.claims_cache_stats()}
+
+# Cold-start timings and schema version
+@app.get("/api/health/startup")
+async def startup_stats():
+    return coldstart.stats()
+
 # Head route fix for Render's health check
 @app.head("/")
 async def head_root():
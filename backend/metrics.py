@@ -0,0 +1,231 @@
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+from starlette.routing import Match
+
+# Minimal Prometheus-compatible registry: counters and histograms with fixed label sets,
+# rendered in the text exposition format (version 0.0.4) by render().
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DB_QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = list(self._values.items())
+        lines += [f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}" for labels, value in items]
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(labels, (list(s[0]), s[1], s[2])) for labels, s in self._values.items()]
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = f'le="{_number(bound) if bound == float("inf") else bound}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+_metrics: List = []
+# Callables returning (name, help, type, [(labels dict, value)]) read at scrape time, so
+# existing stats() counters cost nothing extra on the hot path
+_collectors: List[Callable[[], Iterable[tuple]]] = []
+
+
+def counter(name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+    metric = Counter(name, help, labelnames)
+    _metrics.append(metric)
+    return metric
+
+
+def histogram(name: str, help: str, labelnames: Iterable[str] = (), buckets=LATENCY_BUCKETS) -> Histogram:
+    metric = Histogram(name, help, labelnames, buckets)
+    _metrics.append(metric)
+    return metric
+
+
+def register_collector(collector: Callable[[], Iterable[tuple]]):
+    _collectors.append(collector)
+
+
+def render() -> str:
+    lines = []
+    for metric in _metrics:
+        lines += metric.render()
+    for collector in _collectors:
+        for name, help, kind, samples in collector():
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+            for labels, value in samples:
+                names = tuple(labels)
+                lines.append(f"{name}{_labels(names, tuple(labels[n] for n in names))} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# Application metrics
+
+http_request_duration = histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route", "status")
+)
+http_request_db_queries = histogram(
+    "http_request_db_queries", "Database queries issued while serving a request", ("route",), COUNT_BUCKETS
+)
+http_request_db_duration = histogram(
+    "http_request_db_duration_seconds", "Time spent in database queries per request", ("route",)
+)
+db_query_duration = histogram(
+    "db_query_duration_seconds", "Duration of individual database queries (requests and workers)",
+    (), DB_QUERY_BUCKETS
+)
+groq_request_duration = histogram(
+    "groq_request_duration_seconds", "Groq chat completion latency per attempt", ("model", "status", "stream")
+)
+groq_tokens = counter("groq_tokens_total", "Tokens reported in Groq usage blocks", ("model", "type"))
+newsapi_request_duration = histogram(
+    "newsapi_request_duration_seconds", "NewsAPI request latency", ("endpoint", "status")
+)
+newsapi_errors = counter("newsapi_errors_total", "Failed NewsAPI requests", ("endpoint", "reason"))
+
+
+def record_groq_usage(model: str, usage: Optional[dict]):
+    if not usage:
+        return
+    for kind in ("prompt_tokens", "completion_tokens"):
+        if usage.get(kind):
+            groq_tokens.inc(model, kind.split("_")[0], amount=usage[kind])
+
+
+# Per-request database accounting: the middleware puts a [queries, seconds] holder in a
+# context variable; SQLAlchemy cursor events add to it (contexts are copied into to_thread
+# and greenlets, and the holder is shared by reference).
+_request_db: ContextVar[Optional[list]] = ContextVar("request_db", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    db_query_duration.observe(elapsed)
+    holder = _request_db.get()
+    if holder is not None:
+        holder[0] += 1
+        holder[1] += elapsed
+
+
+def instrument_engine(engine):
+    """Count and time queries on a (sync) Engine; pass async_engine.sync_engine for async ones"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    if route is None:
+        # Responses served before routing (response-cache hits and 304s) never set
+        # scope["route"]; match the app's routes so they keep their template label
+        app = scope.get("app")
+        for candidate in getattr(getattr(app, "router", None), "routes", ()):
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Records latency and database work per route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        holder = [0, 0.0]
+        token = _request_db.set(holder)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_db.reset(token)
+            # Route templates keep label cardinality bounded (/recommended/{user_id}, not each id)
+            route = _route_template(scope)
+            http_request_duration.observe(elapsed, scope["method"], route, str(status["code"]))
+            http_request_db_queries.observe(holder[0], route)
+            if holder[0]:
+                http_request_db_duration.observe(holder[1], route)
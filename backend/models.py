@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Text, Float
+from sqlalchemy import BigInteger, Boolean, Column, ForeignKey, Integer, String, DateTime, Text, Float, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from backend.database import Base
@@ -24,16 +24,36 @@ class NewsArticle(Base):
     url = Column(String, unique=True, index=True)
     image_url = Column(String, nullable=True)
     published_at = Column(DateTime)
-    source = Column(String)
+    source = Column(String, index=True)
     category = Column(String)
     summary = Column(Text, nullable=True)
     translated_title = Column(Text, nullable=True)
     translated_description = Column(Text, nullable=True)
-    created_at = Column(DateTime, server_default=func.now())
+    # Set client-side so stored values share the bound-parameter format used by keyset cursors
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=func.now())
     updated_at = Column(DateTime, onupdate=func.now())
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     user = relationship("User", back_populates="news_articles")
 
+    __table_args__ = (
+        # Keyset pagination for /saved orders by (created_at, id); also serves created_at ranges
+        Index("ix_articles_created_at_id", "created_at", "id"),
+    )
+
+class ArticleCategory(Base):
+    __tablename__ = "article_categories"
+
+    # Feed membership: the same story can be a top headline in several categories, while the
+    # article row (unique on url) keeps only the category it was first stored under
+    article_id = Column(Integer, ForeignKey("articles.id"), primary_key=True)
+    category = Column(String, primary_key=True)
+    published_at = Column(DateTime)  # copied from the article so feeds are one index range scan
+
+    __table_args__ = (
+        # Category feeds: WHERE category = ? ORDER BY published_at DESC
+        Index("ix_article_categories_category_published_at", "category", "published_at"),
+    )
+
 class UserInteraction(Base):
     __tablename__ = "user_interactions"
 
@@ -44,4 +64,90 @@ class UserInteraction(Base):
     
     # Additional fields for recommendation system
     user_id = Column(String, nullable=True)  # Anonymous users will have null user_id
-    interaction_weight = Column(Float, default=1.0)  # Higher weight for clicks vs views 
\ No newline at end of file
+    interaction_weight = Column(Float, default=1.0)  # Higher weight for clicks vs views
+
+    __table_args__ = (
+        Index("ix_user_interactions_user_id_timestamp", "user_id", "timestamp"),
+        Index("ix_user_interactions_article_id", "article_id"),
+    )
+
+class ArticleTranslation(Base):
+    __tablename__ = "article_translations"
+
+    article_id = Column(Integer, ForeignKey("articles.id"), primary_key=True)
+    lang = Column(String, primary_key=True)
+    title = Column(Text, nullable=True)
+    description = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class UserAffinity(Base):
+    __tablename__ = "user_affinities"
+
+    # One row per (user, 'category' | 'source', value), maintained incrementally from interactions.
+    # score is stored time-normalized (weight * 2 ** (age_since_epoch / half_life)) so decay
+    # never needs rewriting old rows and scores stay comparable in a plain ORDER BY. The epoch
+    # (affinity_epoch) moves forward, rescaling every score, before the growth factor gets large.
+    user_id = Column(String, primary_key=True)
+    kind = Column(String, primary_key=True)
+    value = Column(String, primary_key=True)
+    score = Column(Float, default=0.0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class AffinityEpoch(Base):
+    __tablename__ = "affinity_epoch"
+
+    # Single row: the reference time user_affinities scores are normalized to
+    id = Column(Integer, primary_key=True)
+    epoch = Column(DateTime)
+
+class EnrichmentJob(Base):
+    __tablename__ = "enrichment_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    article_id = Column(Integer, ForeignKey("articles.id"))
+    kind = Column(String, default="enrich")
+    status = Column(String, default="queued")  # 'queued', 'running', 'done' or 'failed'
+    attempts = Column(Integer, default=0)
+    available_at = Column(DateTime, default=datetime.utcnow)  # not claimable before this (retry backoff)
+    lease_expires_at = Column(DateTime, nullable=True)  # running jobs past their lease are reclaimed
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("article_id", "kind", name="uq_enrichment_jobs_article_kind"),
+        Index("ix_enrichment_jobs_status_available", "status", "available_at"),
+    )
+
+class LLMCacheEntry(Base):
+    __tablename__ = "llm_cache"
+
+    key = Column(String, primary_key=True)  # sha256 of normalized text + task parameters
+    task = Column(String)  # 'summarization' or 'translation'
+    model = Column(String)
+    value = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, index=True)
+    last_accessed = Column(DateTime, default=datetime.utcnow, index=True)
+
+class ArticleSignature(Base):
+    __tablename__ = "article_signatures"
+
+    # 64-bit SimHash of title + description, split into four 16-bit bands for candidate lookup:
+    # two signatures within Hamming distance 3 always share at least one band exactly.
+    article_id = Column(Integer, ForeignKey("articles.id"), primary_key=True)
+    simhash = Column(BigInteger)  # stored signed so it fits SQLite's INTEGER
+    band0 = Column(Integer, index=True)
+    band1 = Column(Integer, index=True)
+    band2 = Column(Integer, index=True)
+    band3 = Column(Integer, index=True)
+    cluster_id = Column(Integer, index=True)  # id of the cluster's representative (first seen) article
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class SchemaVersion(Base):
+    __tablename__ = "schema_version"
+
+    # Single row: fingerprint of the models, indexes and search DDL the database was last synced to
+    id = Column(Integer, primary_key=True)
+    version = Column(String)
+    applied_at = Column(DateTime, default=datetime.utcnow)
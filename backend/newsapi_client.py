@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+
+import httpx
+from backend import config  # noqa: F401  (loads .env)
+
+from backend.http_client import get_http_client
+from backend import metrics
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+VALID_CATEGORIES = ['business', 'entertainment', 'general', 'health', 'science', 'sports', 'technology']
+
+NEWSAPI_BASE_URL = os.getenv("NEWSAPI_BASE_URL", "https://newsapi.org/v2")
+# Upper bound on concurrent NewsAPI requests during category/page fan-out
+NEWSAPI_CONCURRENCY = int(os.getenv("NEWSAPI_CONCURRENCY", "4"))
+NEWSAPI_TIMEOUT = float(os.getenv("NEWSAPI_TIMEOUT", "15"))
+
+# Don't hammer NewsAPI with validation calls when the key is bad
+NEWSAPI_VALIDATION_RETRY_SECONDS = int(os.getenv("NEWSAPI_VALIDATION_RETRY_SECONDS", "60"))
+
+
+class NewsAPIException(Exception):
+    """Error payload returned by NewsAPI (same interface as newsapi-python's exception)"""
+
+    def __init__(self, exception):
+        self.exception = exception if isinstance(exception, dict) else {"message": str(exception)}
+        super().__init__(self.exception)
+
+    def get_exception(self):
+        return self.exception
+
+    def get_status(self):
+        return self.exception.get("status")
+
+    def get_code(self):
+        return self.exception.get("code")
+
+    def get_message(self):
+        return self.exception.get("message")
+
+
+class AsyncNewsApiClient:
+    """
+    Non-blocking replacement for newsapi-python's NewsApiClient.
+    Requests go through the shared httpx pool and are bounded by a semaphore.
+    """
+
+    def __init__(self, api_key: str, concurrency: int = NEWSAPI_CONCURRENCY):
+        self.api_key = api_key
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def _get(self, endpoint: str, params: dict) -> dict:
+        params = {k: v for k, v in params.items() if v is not None}
+        async with self._semaphore:
+            started = time.perf_counter()
+            try:
+                response = await get_http_client().get(
+                    f"{NEWSAPI_BASE_URL}/{endpoint}",
+                    params=params,
+                    headers={"X-Api-Key": self.api_key},
+                    timeout=NEWSAPI_TIMEOUT
+                )
+            except httpx.HTTPError as e:
+                metrics.newsapi_request_duration.observe(time.perf_counter() - started, endpoint, "error")
+                metrics.newsapi_errors.inc(endpoint, e.__class__.__name__)
+                raise
+        metrics.newsapi_request_duration.observe(time.perf_counter() - started, endpoint, str(response.status_code))
+        try:
+            payload = response.json()
+        except ValueError:
+            metrics.newsapi_errors.inc(endpoint, "invalid_json")
+            raise NewsAPIException({"status": "error", "code": str(response.status_code), "message": response.text})
+        if response.status_code != 200 or payload.get("status") == "error":
+            metrics.newsapi_errors.inc(endpoint, payload.get("code") or f"http_{response.status_code}")
+            raise NewsAPIException(payload)
+        return payload
+
+    async def get_top_headlines(self, q: Optional[str] = None, sources: Optional[str] = None,
+                                language: Optional[str] = None, country: Optional[str] = None,
+                                category: Optional[str] = None, page_size: Optional[int] = None,
+                                page: Optional[int] = None) -> dict:
+        return await self._get("top-headlines", {
+            "q": q,
+            "sources": sources,
+            "language": language,
+            "country": country,
+            "category": category,
+            "pageSize": page_size,
+            "page": page,
+        })
+
+
+_client: Optional[AsyncNewsApiClient] = None
+_client_lock: Optional[asyncio.Lock] = None
+_last_validation_failure = 0.0
+
+
+async def get_newsapi_client() -> Optional[AsyncNewsApiClient]:
+    """Return the process-wide NewsAPI client, validating the key only on first use"""
+    global _client, _client_lock, _last_validation_failure
+    if _client is not None:
+        return _client
+
+    api_key = os.getenv("NEWS_API_KEY")
+    if not api_key or api_key == "your_news_api_key_here":
+        logger.error("NEWS_API_KEY not found in environment variables")
+        return None
+
+    if _client_lock is None:
+        _client_lock = asyncio.Lock()
+    async with _client_lock:
+        if _client is not None:
+            return _client
+        if time.monotonic() - _last_validation_failure < NEWSAPI_VALIDATION_RETRY_SECONDS:
+            return None
+
+        try:
+            client = AsyncNewsApiClient(api_key=api_key)
+            # Test the API key once per process
+            await client.get_top_headlines(language='en', country='us', page_size=1)
+            logger.info("News API key validated successfully")
+            _client = client
+            return _client
+        except Exception as e:
+            logger.error(f"News API key validation failed: {str(e)}")
+            _last_validation_failure = time.monotonic()
+            return None
+
+
+def stats() -> dict:
+    return {"client_ready": _client is not None}
@@ -0,0 +1,66 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# bcrypt is deliberately slow (hundreds of ms of CPU per call). It runs on this pool instead of
+# the event loop; the bcrypt extension releases the GIL, so workers hash in parallel.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Hashes running or waiting for a worker; past this, auth requests get a fast 503 instead of
+# queueing behind seconds of bcrypt work
+PASSWORD_HASH_QUEUE_MAX = int(os.getenv("PASSWORD_HASH_QUEUE_MAX", str(PASSWORD_HASH_WORKERS * 8)))
+
+_context = None
+_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_in_flight = 0
+_stats = {"hashed": 0, "verified": 0, "rejected": 0}
+
+
+def context():
+    """The passlib CryptContext, imported on first use so it stays off the startup path"""
+    global _context
+    if _context is None:
+        from passlib.context import CryptContext
+        _context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _context
+
+
+class HashingBusy(Exception):
+    """Raised when PASSWORD_HASH_QUEUE_MAX hashes are already running or queued"""
+
+
+async def _run(func):
+    global _in_flight
+    if _in_flight >= PASSWORD_HASH_QUEUE_MAX:
+        _stats["rejected"] += 1
+        raise HashingBusy("Password hashing pool is saturated")
+    _in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, func)
+    finally:
+        _in_flight -= 1
+
+
+async def hash_password(password: str) -> str:
+    hashed = await _run(lambda: context().hash(password))
+    _stats["hashed"] += 1
+    return hashed
+
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    valid = await _run(lambda: context().verify(password, hashed_password))
+    _stats["verified"] += 1
+    return valid
+
+
+def stats() -> dict:
+    return {
+        **_stats,
+        "in_flight": _in_flight,
+        "workers": PASSWORD_HASH_WORKERS,
+        "queue_max": PASSWORD_HASH_QUEUE_MAX,
+    }
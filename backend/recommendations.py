@@ -0,0 +1,173 @@
+import logging
+import math
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Iterable, List
+
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session, aliased
+
+from backend.database import dialect_insert
+from backend.models import AffinityEpoch, NewsArticle, UserAffinity, UserInteraction
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+AFFINITY_HALF_LIFE_DAYS = float(os.getenv("AFFINITY_HALF_LIFE_DAYS", "14"))
+# Only articles published within this window are scored, which keeps the query bounded
+RECOMMENDATION_WINDOW_DAYS = int(os.getenv("RECOMMENDATION_WINDOW_DAYS", "7"))
+RECOMMENDATION_LIMIT = 10
+
+# Initial reference point for time-normalized scores; decay is applied relative to it
+_SCORE_EPOCH = datetime(2024, 1, 1)
+# Once events are this many half-lives past the epoch (growth 2 ** 64), the epoch is moved up to
+# them and stored scores are scaled down to match, long before floats lose range
+AFFINITY_REBASE_HALF_LIVES = 64
+# Hard cap on the growth exponent (2 ** 1024 overflows a float)
+_MAX_GROWTH_EXPONENT = 512
+
+
+def _half_lives(ts: datetime, epoch: datetime) -> float:
+    return (ts - epoch).total_seconds() / 86400 / AFFINITY_HALF_LIFE_DAYS
+
+
+def _growth(ts: datetime, epoch: datetime = _SCORE_EPOCH) -> float:
+    """
+    Weight multiplier for an event at ts. Storing weight * growth(ts) instead of decaying old
+    scores is equivalent to exponential decay with AFFINITY_HALF_LIFE_DAYS, since every score
+    shares the same decay factor at query time.
+    """
+    return 2 ** min(_half_lives(ts, epoch), _MAX_GROWTH_EXPONENT)
+
+
+def _epoch_for(db: Session, latest: datetime) -> datetime:
+    """
+    The epoch to normalize events up to `latest` against, rebasing first when they are more
+    than AFFINITY_REBASE_HALF_LIVES past the stored one. Does not commit.
+    """
+    row = db.query(AffinityEpoch).filter(AffinityEpoch.id == 1).first()
+    epoch = row.epoch if row else _SCORE_EPOCH
+    shift = math.floor(_half_lives(latest, epoch))
+    if shift <= AFFINITY_REBASE_HALF_LIVES:
+        return epoch
+
+    epoch += timedelta(days=shift * AFFINITY_HALF_LIFE_DAYS)
+    # Relative order is unchanged; scores decayed past float range simply become 0
+    factor = 2.0 ** -shift
+    db.query(UserAffinity).update({UserAffinity.score: UserAffinity.score * factor}, synchronize_session=False)
+    if row is None:
+        db.add(AffinityEpoch(id=1, epoch=epoch))
+    else:
+        row.epoch = epoch
+    db.flush()
+    logger.info(f"Affinity scores rebased by {shift} half-lives to epoch {epoch.isoformat()}")
+    return epoch
+
+
+def update_profiles(db: Session, interactions: Iterable[UserInteraction]):
+    """
+    Fold a batch of interactions into user_affinities. Anonymous interactions are skipped.
+    Does not commit; callers commit together with the interactions themselves.
+    """
+    interactions = [i for i in interactions if i.user_id]
+    if not interactions:
+        return
+
+    article_ids = {i.article_id for i in interactions}
+    articles = {
+        article_id: (category, source)
+        for article_id, category, source in db.query(
+            NewsArticle.id, NewsArticle.category, NewsArticle.source
+        ).filter(NewsArticle.id.in_(article_ids)).all()
+    }
+
+    now = datetime.utcnow()
+    epoch = _epoch_for(db, max(i.timestamp or now for i in interactions))
+    increments = defaultdict(float)
+    for interaction in interactions:
+        article = articles.get(interaction.article_id)
+        if article is None:
+            continue
+        category, source = article
+        weight = (interaction.interaction_weight or 1.0) * _growth(interaction.timestamp or now, epoch)
+        if category:
+            increments[(interaction.user_id, "category", category)] += weight
+        if source:
+            increments[(interaction.user_id, "source", source)] += weight
+    if not increments:
+        return
+
+    insert = dialect_insert(db)
+    stmt = insert(UserAffinity).values([
+        {"user_id": user_id, "kind": kind, "value": value, "score": score, "updated_at": now}
+        for (user_id, kind, value), score in increments.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "kind", "value"],
+        set_={"score": UserAffinity.score + stmt.excluded.score, "updated_at": now}
+    )
+    db.execute(stmt)
+
+
+def recommend(db: Session, user_id: str, limit: int = RECOMMENDATION_LIMIT) -> List[NewsArticle]:
+    """
+    Score recent articles by the user's category + source affinity in a single query.
+    Users without a profile get the latest articles (all scores are zero).
+    """
+    category_affinity = aliased(UserAffinity)
+    source_affinity = aliased(UserAffinity)
+    score = func.coalesce(category_affinity.score, 0.0) + func.coalesce(source_affinity.score, 0.0)
+
+    query = db.query(NewsArticle).outerjoin(
+        category_affinity,
+        and_(
+            category_affinity.user_id == user_id,
+            category_affinity.kind == "category",
+            category_affinity.value == NewsArticle.category,
+        )
+    ).outerjoin(
+        source_affinity,
+        and_(
+            source_affinity.user_id == user_id,
+            source_affinity.kind == "source",
+            source_affinity.value == NewsArticle.source,
+        )
+    ).order_by(score.desc(), NewsArticle.published_at.desc())
+
+    since = datetime.utcnow() - timedelta(days=RECOMMENDATION_WINDOW_DAYS)
+    articles = query.filter(NewsArticle.published_at >= since).limit(limit).all()
+    if not articles:
+        # Nothing recent stored (e.g. ingestion paused); fall back to the whole table
+        articles = query.limit(limit).all()
+    return articles
+
+
+def rebuild_profiles(db: Session, batch_size: int = 5000):
+    """Recompute every profile from the interaction history (for databases predating profiles)"""
+    db.query(UserAffinity).delete(synchronize_session=False)
+    db.query(AffinityEpoch).delete(synchronize_session=False)
+    last_id = 0
+    while True:
+        batch = db.query(UserInteraction).filter(
+            UserInteraction.id > last_id,
+            UserInteraction.user_id.isnot(None)
+        ).order_by(UserInteraction.id).limit(batch_size).all()
+        if not batch:
+            break
+        update_profiles(db, batch)
+        last_id = batch[-1].id
+    db.commit()
+
+
+if __name__ == "__main__":
+    from backend.database import Base, SessionLocal, engine
+
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        rebuild_profiles(session)
+        logger.info("User affinity profiles rebuilt")
+    finally:
+        session.close()
@@ -0,0 +1,274 @@
+import asyncio
+import gzip
+import hashlib
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:
+    # Optional; responses are gzip-compressed without it
+    brotli = None
+
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+# How long a rendered feed is reused server-side. Ingestion invalidates earlier when it stores
+# new articles; the TTL bounds staleness of summaries/translations filled in by the workers.
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "60"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+# Browser / CDN freshness for shared feeds and for per-user recommendations
+RESPONSE_CACHE_MAX_AGE = int(os.getenv("RESPONSE_CACHE_MAX_AGE", "30"))
+RESPONSE_CACHE_STALE_WHILE_REVALIDATE = int(os.getenv("RESPONSE_CACHE_STALE_WHILE_REVALIDATE", "60"))
+RESPONSE_CACHE_PRIVATE_MAX_AGE = int(os.getenv("RESPONSE_CACHE_PRIVATE_MAX_AGE", "15"))
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "500"))
+
+# Routes served through the cache, and whether their responses are specific to one user
+CACHED_ROUTES = [
+    (re.compile(r"^/api/news/latest$"), False),
+    (re.compile(r"^/api/news/category/[^/]+$"), False),
+    (re.compile(r"^/api/news/recommended/[^/]+$"), True),
+]
+
+
+class _Entry:
+    __slots__ = ("body", "content_type", "etag", "last_modified", "private", "expires", "encoded")
+
+    def __init__(self, body: bytes, content_type: str, etag: str, last_modified: float, private: bool):
+        self.body = body
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+        self.private = private
+        self.expires = time.monotonic() + RESPONSE_CACHE_TTL_SECONDS
+        # encoding -> compressed body, filled on first request for that encoding
+        self.encoded: Dict[str, bytes] = {}
+
+    def body_for(self, encoding: Optional[str]) -> bytes:
+        if encoding is None:
+            return self.body
+        if encoding not in self.encoded:
+            if encoding == "br":
+                self.encoded[encoding] = brotli.compress(self.body, quality=5)
+            else:
+                self.encoded[encoding] = gzip.compress(self.body, compresslevel=6)
+        return self.encoded[encoding]
+
+
+_entries: "OrderedDict[str, _Entry]" = OrderedDict()
+# key -> (etag, last_modified); survives invalidation so unchanged content keeps its date
+_validators: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+_locks: Dict[str, asyncio.Lock] = {}
+_generation = 0
+_stats = {"hits": 0, "misses": 0, "not_modified": 0, "invalidations": 0, "uncacheable": 0}
+
+
+def route_for(path: str) -> Optional[bool]:
+    """None if the path isn't cached, else whether it is private (per-user)"""
+    for pattern, private in CACHED_ROUTES:
+        if pattern.match(path):
+            return private
+    return None
+
+
+def invalidate():
+    """Drop every cached response (called when ingestion stores new articles)"""
+    global _generation
+    _generation += 1
+    _entries.clear()
+    _stats["invalidations"] += 1
+
+
+def _cache_key(scope) -> str:
+    query = scope.get("query_string", b"").decode("latin-1")
+    params = "&".join(sorted(part for part in query.split("&") if part))
+    return f"{scope['path']}?{params}"
+
+
+def _lookup(key: str) -> Optional[_Entry]:
+    entry = _entries.get(key)
+    if entry is None:
+        return None
+    if entry.expires <= time.monotonic():
+        del _entries[key]
+        return None
+    _entries.move_to_end(key)
+    return entry
+
+
+def _store(key: str, entry: _Entry):
+    _entries[key] = entry
+    _entries.move_to_end(key)
+    while len(_entries) > RESPONSE_CACHE_MAX_ENTRIES:
+        _entries.popitem(last=False)
+    _validators[key] = (entry.etag, entry.last_modified)
+    _validators.move_to_end(key)
+    while len(_validators) > RESPONSE_CACHE_MAX_ENTRIES * 4:
+        _validators.popitem(last=False)
+
+
+def _make_entry(key: str, body: bytes, content_type: str, private: bool) -> _Entry:
+    # Weak: the same entity is served gzip, brotli or uncompressed
+    etag = f'W/"{hashlib.sha1(body).hexdigest()}"'
+    previous = _validators.get(key)
+    last_modified = previous[1] if previous and previous[0] == etag else time.time()
+    return _Entry(body, content_type, etag, last_modified, private)
+
+
+def _accepted_encoding(headers: Headers, size: int) -> Optional[str]:
+    if size < COMPRESS_MIN_BYTES:
+        return None
+    accepted = {}
+    for item in headers.get("accept-encoding", "").split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        match = re.search(r"q=([0-9.]+)", params)
+        if match:
+            try:
+                q = float(match.group(1))
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def _not_modified(entry: _Entry, headers: Headers) -> bool:
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison (RFC 9110 13.1.2)
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return entry.etag.removeprefix("W/") in tags
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(entry.last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _cache_control(entry: _Entry) -> str:
+    if entry.private:
+        return f"private, max-age={RESPONSE_CACHE_PRIVATE_MAX_AGE}"
+    return (f"public, max-age={RESPONSE_CACHE_MAX_AGE}, "
+            f"stale-while-revalidate={RESPONSE_CACHE_STALE_WHILE_REVALIDATE}")
+
+
+async def _send_entry(entry: _Entry, request_headers: Headers, send, cache_status: str):
+    headers: List[Tuple[bytes, bytes]] = [
+        (b"etag", entry.etag.encode()),
+        (b"last-modified", formatdate(entry.last_modified, usegmt=True).encode()),
+        (b"cache-control", _cache_control(entry).encode()),
+        (b"vary", b"Accept-Encoding"),
+        (b"x-cache", cache_status.encode()),
+    ]
+    if _not_modified(entry, request_headers):
+        _stats["not_modified"] += 1
+        await send({"type": "http.response.start", "status": 304, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+        return
+
+    encoding = _accepted_encoding(request_headers, len(entry.body))
+    body = entry.body_for(encoding)
+    headers += [(b"content-type", entry.content_type.encode()), (b"content-length", str(len(body)).encode())]
+    if encoding:
+        headers.append((b"content-encoding", encoding.encode()))
+    await send({"type": "http.response.start", "status": 200, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _capture(app, scope, receive) -> Tuple[dict, bytes]:
+    """Run the app and collect its response instead of sending it"""
+    start, chunks = {}, []
+
+    async def collect(message):
+        if message["type"] == "http.response.start":
+            start.update(message)
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, collect)
+    return start, b"".join(chunks)
+
+
+class ResponseCacheMiddleware:
+    """
+    In-memory cache for the feed routes. Responses are keyed by path and query string, served
+    with ETag / Last-Modified (304 on revalidation), gzip or brotli compressed, and marked
+    cacheable for browsers and CDNs. Concurrent misses for the same key render once.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        private = route_for(scope["path"]) if scope["type"] == "http" else None
+        if not RESPONSE_CACHE_ENABLED or private is None or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        key = _cache_key(scope)
+        entry = _lookup(key)
+        if entry is not None:
+            _stats["hits"] += 1
+            await _send_entry(entry, request_headers, send, "HIT")
+            return
+
+        lock = _locks.setdefault(key, asyncio.Lock())
+        try:
+            async with lock:
+                entry = _lookup(key)
+                if entry is not None:
+                    _stats["hits"] += 1
+                    await _send_entry(entry, request_headers, send, "HIT")
+                    return
+
+                _stats["misses"] += 1
+                generation = _generation
+                start, body = await _capture(self.app, scope, receive)
+                response_headers = Headers(raw=start.get("headers", []))
+                content_type = response_headers.get("content-type", "")
+                no_store = "no-store" in response_headers.get("cache-control", "")
+                if start.get("status") != 200 or not content_type.startswith("application/json") or no_store:
+                    # Errors, no-store responses (e.g. translations still pending) and anything
+                    # unexpected pass through untouched and uncached
+                    _stats["uncacheable"] += 1
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+                entry = _make_entry(key, body, content_type, private)
+                # Don't cache a response rendered from data that was invalidated meanwhile
+                if generation == _generation:
+                    _store(key, entry)
+        finally:
+            # Keys come from client-chosen query strings; drop the lock on every exit path
+            if not lock.locked():
+                _locks.pop(key, None)
+        await _send_entry(entry, request_headers, send, "MISS")
+
+
+def stats() -> dict:
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        **_stats,
+        "entries": len(_entries),
+        "hit_ratio": round(_stats["hits"] / lookups, 3) if lookups else None,
+        "brotli": brotli is not None,
+    }
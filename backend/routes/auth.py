@@ -1,26 +1,32 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from typing import Optional
 from backend.models import User
 from backend.schemas import UserCreate, UserResponse, Token
-from backend.database import get_db
-from dotenv import load_dotenv
+from backend.database import get_async_db
+from backend import passwords
+from backend import config  # noqa: F401  (loads .env)
 import os
+import time
 
-load_dotenv()
 
 router = APIRouter()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/token")
 
 # JWT Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+# Decoded claims of recently seen tokens. Tokens are stateless (there is no revocation), so a
+# claim set stays valid until its exp and protected routes need neither a decode nor a DB hit.
+JWT_CLAIMS_CACHE_SIZE = int(os.getenv("JWT_CLAIMS_CACHE_SIZE", "10000"))
+
+_claims_cache: "OrderedDict[str, dict]" = OrderedDict()
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -32,27 +38,71 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def decode_access_token(token: str) -> dict:
+    """Verified claims for token (cached until it expires); raises JWTError if invalid"""
+    claims = _claims_cache.get(token)
+    if claims is not None:
+        if claims["exp"] > time.time():
+            _claims_cache.move_to_end(token)
+            return claims
+        del _claims_cache[token]
+    claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    if not claims.get("sub") or "exp" not in claims:
+        raise JWTError("Token is missing sub or exp")
+    _claims_cache[token] = claims
+    while len(_claims_cache) > JWT_CLAIMS_CACHE_SIZE:
+        _claims_cache.popitem(last=False)
+    return claims
+
+def claims_cache_stats() -> dict:
+    return {"cached_tokens": len(_claims_cache), "cache_size": JWT_CLAIMS_CACHE_SIZE}
+
+async def get_current_user_claims(token: str = Depends(oauth2_scheme)) -> dict:
+    """Dependency for protected routes: the caller's JWT claims, without a users table lookup"""
+    try:
+        return decode_access_token(token)
+    except JWTError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is busy, retry shortly",
+        headers={"Retry-After": "1"}
+    )
+
 @router.post("/register", response_model=UserResponse)
-async def register(user: UserCreate, db: Session = Depends(get_db)):
-    db_user = db.query(User).filter(User.email == user.email).first()
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    db_user = await db.scalar(select(User).where(User.email == user.email))
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
     
-    hashed_password = pwd_context.hash(user.password)
+    try:
+        hashed_password = await passwords.hash_password(user.password)
+    except passwords.HashingBusy:
+        raise _hashing_busy()
     db_user = User(
         email=user.email,
         hashed_password=hashed_password,
         full_name=user.full_name
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 @router.post("/token", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not pwd_context.verify(form_data.password, user.hashed_password):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    user = await db.scalar(select(User).where(User.email == form_data.username))
+    try:
+        valid = user is not None and await passwords.verify_password(form_data.password, user.hashed_password)
+    except passwords.HashingBusy:
+        raise _hashing_busy()
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -63,4 +113,8 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
     access_token = create_access_token(
         data={"sub": user.email}, expires_delta=access_token_expires
     )
-    return {"access_token": access_token, "token_type": "bearer"} 
\ No newline at end of file
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@router.get("/me")
+async def read_me(claims: dict = Depends(get_current_user_claims)):
+    return {"email": claims["sub"], "expires_at": datetime.utcfromtimestamp(claims["exp"])}
@@ -1,283 +1,113 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Body, Response
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from newsapi import NewsApiClient
-from newsapi.newsapi_exception import NewsAPIException
-from dotenv import load_dotenv
-import os
+from backend import config  # noqa: F401  (loads .env)
 from datetime import datetime
-import httpx
 import json
+import base64
 import logging
-from gtts import gTTS
-import io
-from backend.models import NewsArticle, UserInteraction
-from backend.schemas import NewsArticleCreate, NewsArticleResponse
-from backend.database import get_db
+from backend.models import NewsArticle, ArticleTranslation, ArticleCategory
+from backend.languages import LANGUAGE_NAMES, is_supported
+from backend.schemas import NewsArticleResponse, SavedNewsPage, SearchResponse, InteractionCreate, InteractionBatch
+from backend.database import get_async_db
+from backend.newsapi_client import VALID_CATEGORIES, NewsAPIException
+from backend import ingestion, recommendations, interaction_buffer, search, tts, jobs, dedup
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-load_dotenv()
 
 router = APIRouter()
 
-def get_newsapi_client() -> Optional[NewsApiClient]:
-    api_key = os.getenv("NEWS_API_KEY")
-    if not api_key or api_key == "your_news_api_key_here":
-        logger.error("NEWS_API_KEY not found in environment variables")
-        return None
-    
-    try:
-        client = NewsApiClient(api_key=api_key)
-        # Test the API key by making a simple request
-        test_response = client.get_top_headlines(language='en', country='us', page_size=1)
-        if test_response.get('status') == 'error':
-            logger.error(f"News API key validation failed: {test_response.get('message')}")
-            return None
-        logger.info("News API key validated successfully")
-        return client
-    except Exception as e:
-        logger.error(f"Error creating News API client: {str(e)}")
-        return None
-
-def parse_datetime(date_str: str) -> datetime:
-    try:
-        if not date_str:
-            return datetime.utcnow()
-        return datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%SZ")
-    except (ValueError, TypeError) as e:
-        logger.warning(f"Error parsing datetime {date_str}: {str(e)}")
-        return datetime.utcnow()
-
-async def call_groq_api(prompt: str, model: str = "mixtral-8x7b-v0.1") -> str:
-    """Call Groq API with a prompt and return the response"""
-    if not prompt:
-        return ""
-    
-    try:
-        api_key = os.getenv("GROQ_API_KEY")
-        if not api_key:
-            logger.error("GROQ_API_KEY not found in environment variables")
-            return prompt
-
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        data = {
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "You are a professional translator and summarizer. Provide accurate and natural translations while maintaining the original meaning."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "model": model,
-            "temperature": 0.3,
-            "max_tokens": 1000
-        }
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                headers=headers,
-                json=data,
-                timeout=30.0
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result["choices"][0]["message"]["content"].strip()
-            else:
-                logger.error(f"Groq API error: {response.status_code} - {response.text}")
-                return prompt
-    except Exception as e:
-        logger.error(f"Error calling Groq API: {str(e)}")
-        return prompt
-
-async def translate_text(text: str, target_lang: str) -> str:
-    """Translate text using Groq API with language-specific instructions"""
-    if not text:
-        return ""
-    
-    language_prompts = {
-        'ar': 'Translate to Modern Standard Arabic:',
-        'bn': 'Translate to Standard Bengali:',
-        'zh': 'Translate to Simplified Chinese:',
-        'en': 'Translate to English:',
-        'fr': 'Translate to French:',
-        'de': 'Translate to German:',
-        'hi': 'Translate to Hindi:',
-        'id': 'Translate to Indonesian:',
-        'it': 'Translate to Italian:',
-        'ja': 'Translate to Japanese:',
-        'ko': 'Translate to Korean:',
-        'pt': 'Translate to Portuguese:',
-        'ru': 'Translate to Russian:',
-        'es': 'Translate to Spanish:',
-        'tr': 'Translate to Turkish:'
-    }
-    
-    prompt = f"""{language_prompts.get(target_lang, f'Translate to {target_lang}:')}
+FEED_PAGE_SIZE = 10
+# With ?collapse=true, this many times the page size is read so a full page survives collapsing
+COLLAPSE_OVERFETCH = 3
 
-{text}
+async def with_translations(db: AsyncSession, articles: List[NewsArticle], lang: Optional[str],
+                            response: Optional[Response] = None) -> List[NewsArticleResponse]:
+    """
+    Serve translated_title / translated_description in the requested language from
+    article_translations. Missing translations come back empty and are requested from the
+    workers; such a response is marked no-store so neither browsers nor the response cache
+    keep it after the translations land.
+    """
+    if not lang:
+        return articles
+    lang = lang.lower()
+    if lang != "en" and not is_supported(lang):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported language. Must be one of: en, {', '.join(LANGUAGE_NAMES)}"
+        )
 
-Translate the above text naturally and accurately, maintaining the original meaning and tone."""
-    
-    return await call_groq_api(prompt)
+    ids = [article.id for article in articles]
+    translations = {}
+    if lang != "en" and ids:
+        translations = {
+            t.article_id: t for t in (await db.scalars(select(ArticleTranslation).where(
+                ArticleTranslation.article_id.in_(ids),
+                ArticleTranslation.lang == lang
+            ))).all()
+        }
+        missing = [article_id for article_id in ids if article_id not in translations]
+        if missing:
+            jobs.request_translations(missing, lang)
+            if response is not None:
+                response.headers["Cache-Control"] = "no-store"
 
-async def summarize_text(text: str, max_length: int = 150) -> str:
-    """Summarize text using Groq API"""
-    if not text:
-        return ""
-    
-    prompt = f"""Summarize the following text in about {max_length} characters. Provide ONLY the summary, no explanations:
+    items = []
+    for article in articles:
+        item = NewsArticleResponse.model_validate(article)
+        if lang == "en":
+            title, description = article.title, article.description
+        elif article.id in translations:
+            title, description = translations[article.id].title, translations[article.id].description
+        else:
+            title, description = None, None
+        items.append(item.model_copy(update={
+            "translated_title": title,
+            "translated_description": description,
+            "translation_lang": lang,
+        }))
+    return items
 
-{text}"""
-    
-    return await call_groq_api(prompt)
+async def _category_feed(category: str, db: AsyncSession, collapse: bool) -> List[NewsArticle]:
+    limit = FEED_PAGE_SIZE * COLLAPSE_OVERFETCH if collapse else FEED_PAGE_SIZE
+    articles = (await db.scalars(select(NewsArticle).join(
+        ArticleCategory, ArticleCategory.article_id == NewsArticle.id
+    ).where(
+        ArticleCategory.category == category
+    ).order_by(ArticleCategory.published_at.desc()).limit(limit))).all()
+    if collapse:
+        return await db.run_sync(lambda session: dedup.collapse(session, articles, FEED_PAGE_SIZE))
+    return articles
 
-async def process_article(article: NewsArticle, db: Session):
-    """Process article for translation and summarization"""
-    try:
-        # Summarize description
-        if article.description and not article.summary:
-            article.summary = await summarize_text(article.description)
-        
-        # Translate title and description
-        if article.title and not article.translated_title:
-            article.translated_title = await translate_text(article.title)
-        
-        if article.description and not article.translated_description:
-            article.translated_description = await translate_text(article.description)
-        
-        db.add(article)
-        try:
-            db.commit()
-            db.refresh(article)
-        except Exception as db_error:
-            logger.error(f"Database error while processing article: {str(db_error)}")
-            db.rollback()
-    except Exception as e:
-        logger.error(f"Error processing article: {str(e)}")
+async def _serve_category_from_db(category: str, db: AsyncSession, collapse: bool = False) -> List[NewsArticle]:
+    """Feeds are read from the articles table kept fresh by the ingestion scheduler"""
+    articles = await _category_feed(category, db, collapse)
+    if articles or ingestion.has_been_ingested(category):
+        return articles
 
-async def text_to_speech(text: str, lang: str = 'en') -> bytes:
-    """Convert text to speech using gTTS"""
+    # Cold start: nothing stored for this category yet and the scheduler hasn't reached it
     try:
-        # Map language codes to gTTS compatible codes
-        lang_map = {
-            'en': 'en',
-            'hi': 'hi',
-            'ar': 'ar',
-            'bn': 'bn',
-            'zh': 'zh-CN',
-            'fr': 'fr',
-            'de': 'de',
-            'id': 'id',
-            'it': 'it',
-            'ja': 'ja',
-            'ko': 'ko',
-            'pt': 'pt',
-            'ru': 'ru',
-            'es': 'es',
-            'tr': 'tr'
-        }
-        
-        # Get the correct language code or default to English
-        tts_lang = lang_map.get(lang.lower(), 'en')
-        logger.info(f"Converting text to speech in language: {tts_lang}")
-        
-        # Create gTTS object
-        tts = gTTS(text=text, lang=tts_lang, slow=False)
-        
-        # Save to bytes buffer
-        fp = io.BytesIO()
-        tts.write_to_fp(fp)
-        fp.seek(0)
-        
-        return fp.read()
-    except Exception as e:
-        logger.error(f"Error in text to speech conversion: {str(e)}")
+        await ingestion.ingest_category(category)
+    except ingestion.NewsSourceUnavailable:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to convert text to speech: {str(e)}"
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="NEWS_API_KEY not configured. Please add your News API key to the .env file."
         )
+    return await _category_feed(category, db, collapse)
 
 @router.get("/latest", response_model=List[NewsArticleResponse])
-async def get_latest_news(background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+async def get_latest_news(response: Response, lang: Optional[str] = None, collapse: bool = False,
+                          db: AsyncSession = Depends(get_async_db)):
     try:
-        newsapi = get_newsapi_client()
-        if not newsapi:
-            logger.error("NEWS_API_KEY not configured")
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="NEWS_API_KEY not configured. Please add your News API key to the .env file."
-            )
-
-        logger.info("Fetching latest news from News API")
-        top_headlines = newsapi.get_top_headlines(
-            language='en',
-            country='us',
-            page_size=10
-        )
-        
-        if not top_headlines.get('articles'):
-            logger.warning("No articles found in API response")
-            return []
-        
-        articles = []
-        for article_data in top_headlines['articles']:
-            try:
-                if not all([article_data.get('title'), article_data.get('url')]):
-                    logger.warning(f"Skipping article with missing title or URL: {article_data}")
-                    continue
-                    
-                # Check for existing article
-                existing_article = db.query(NewsArticle).filter(NewsArticle.url == article_data['url']).first()
-                if existing_article:
-                    articles.append(existing_article)
-                    continue
-                
-                # Create new article
-                article = NewsArticle(
-                    title=article_data['title'],
-                    description=article_data.get('description') or "No description available",
-                    url=article_data['url'],
-                    image_url=article_data.get('urlToImage'),
-                    published_at=parse_datetime(article_data.get('publishedAt')),
-                    source=article_data.get('source', {}).get('name', 'Unknown'),
-                    category="general"
-                )
-                db.add(article)
-                articles.append(article)
-                
-                # Add background task for processing
-                background_tasks.add_task(process_article, article, db)
-            except Exception as article_error:
-                logger.error(f"Error processing article data: {str(article_error)}")
-                continue
-        
-        try:
-            db.commit()
-            # Refresh all new articles to get their IDs
-            for article in articles:
-                db.refresh(article)
-            logger.info(f"Successfully processed {len(articles)} articles")
-            return articles
-        except Exception as db_error:
-            logger.error(f"Database error: {str(db_error)}")
-            db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Database error"
-            )
-            
+        return await with_translations(db, await _serve_category_from_db("general", db, collapse), lang, response)
+    except HTTPException:
+        raise
     except NewsAPIException as api_error:
         logger.error(f"News API error: {str(api_error)}")
         raise HTTPException(
@@ -292,78 +122,18 @@ async def get_latest_news(background_tasks: BackgroundTasks, db: Session = Depen
         )
 
 @router.get("/category/{category}", response_model=List[NewsArticleResponse])
-async def get_news_by_category(category: str, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
-    try:
-        newsapi = get_newsapi_client()
-        if not newsapi:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="NEWS_API_KEY not configured. Please add your News API key to the .env file."
-            )
-
-        valid_categories = ['business', 'entertainment', 'general', 'health', 'science', 'sports', 'technology']
-        if category.lower() not in valid_categories:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid category. Must be one of: {', '.join(valid_categories)}"
-            )
-            
-        category_news = newsapi.get_top_headlines(
-            category=category.lower(),
-            language='en',
-            country='us',
-            page_size=10
+async def get_news_by_category(category: str, response: Response, lang: Optional[str] = None,
+                               collapse: bool = False, db: AsyncSession = Depends(get_async_db)):
+    if category.lower() not in VALID_CATEGORIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid category. Must be one of: {', '.join(VALID_CATEGORIES)}"
         )
-        
-        if not category_news.get('articles'):
-            logger.warning(f"No articles found for category: {category}")
-            return []
-        
-        articles = []
-        for article_data in category_news['articles']:
-            try:
-                if not all([article_data.get('title'), article_data.get('url')]):
-                    continue
-                    
-                # Check for existing article
-                existing_article = db.query(NewsArticle).filter(NewsArticle.url == article_data['url']).first()
-                if existing_article:
-                    articles.append(existing_article)
-                    continue
-                
-                # Create new article
-                article = NewsArticle(
-                    title=article_data['title'],
-                    description=article_data.get('description') or "No description available",
-                    url=article_data['url'],
-                    image_url=article_data.get('urlToImage'),
-                    published_at=parse_datetime(article_data.get('publishedAt')),
-                    source=article_data.get('source', {}).get('name', 'Unknown'),
-                    category=category.lower()
-                )
-                db.add(article)
-                articles.append(article)
-                
-                # Add background task for processing
-                background_tasks.add_task(process_article, article, db)
-            except Exception as article_error:
-                logger.error(f"Error processing article data: {str(article_error)}")
-                continue
-        
-        try:
-            db.commit()
-            # Refresh all new articles to get their IDs
-            for article in articles:
-                db.refresh(article)
-        except Exception as db_error:
-            logger.error(f"Database error: {str(db_error)}")
-            db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Database error"
-            )
-            
-        return articles
+
+    try:
+        return await with_translations(db, await _serve_category_from_db(category.lower(), db, collapse), lang, response)
+    except HTTPException:
+        raise
     except NewsAPIException as api_error:
         logger.error(f"News API error: {str(api_error)}")
         raise HTTPException(
@@ -377,11 +147,67 @@ async def get_news_by_category(category: str, background_tasks: BackgroundTasks,
             detail="An unexpected error occurred"
         )
 
-@router.get("/saved", response_model=List[NewsArticleResponse])
-async def get_saved_news(db: Session = Depends(get_db)):
+@router.get("/freshness")
+async def get_freshness():
+    """Per-category ingestion freshness timestamps"""
+    return ingestion.freshness()
+
+SAVED_PAGE_DEFAULT = 20
+SAVED_PAGE_MAX = 100
+
+def encode_cursor(article: NewsArticle) -> str:
+    raw = json.dumps([article.created_at.isoformat(), article.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor: str):
     try:
-        articles = db.query(NewsArticle).order_by(NewsArticle.created_at.desc()).all()
-        return articles
+        created_at, article_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), int(article_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+@router.get("/saved", response_model=SavedNewsPage)
+async def get_saved_news(
+    response: Response,
+    limit: int = Query(SAVED_PAGE_DEFAULT, ge=1, le=SAVED_PAGE_MAX),
+    cursor: Optional[str] = None,
+    category: Optional[str] = None,
+    source: Optional[str] = None,
+    lang: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Stored articles, newest first, paginated on (created_at, id)"""
+    position = decode_cursor(cursor) if cursor else None
+    try:
+        query = select(NewsArticle)
+        if category:
+            query = query.where(NewsArticle.id.in_(select(ArticleCategory.article_id).where(
+                ArticleCategory.category == category.lower()
+            )))
+        if source:
+            query = query.where(NewsArticle.source == source)
+        if position:
+            created_at, article_id = position
+            query = query.where(or_(
+                NewsArticle.created_at < created_at,
+                and_(NewsArticle.created_at == created_at, NewsArticle.id < article_id)
+            ))
+
+        # Fetch one extra row to know whether another page exists
+        articles = (await db.scalars(query.order_by(
+            NewsArticle.created_at.desc(), NewsArticle.id.desc()
+        ).limit(limit + 1))).all()
+
+        next_cursor = None
+        if len(articles) > limit:
+            articles = articles[:limit]
+            next_cursor = encode_cursor(articles[-1])
+        return {"items": await with_translations(db, articles, lang, response), "next_cursor": next_cursor}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching saved news: {str(e)}")
         raise HTTPException(
@@ -389,66 +215,83 @@ async def get_saved_news(db: Session = Depends(get_db)):
             detail="Failed to fetch saved news"
         )
 
-@router.post("/interaction")
-async def record_interaction(
-    interaction: dict,
-    db: Session = Depends(get_db)
+SEARCH_PAGE_MAX = 50
+
+@router.get("/search", response_model=SearchResponse)
+async def search_news(
+    q: str = Query(..., min_length=1, max_length=200),
+    category: Optional[str] = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    limit: int = Query(20, ge=1, le=SEARCH_PAGE_MAX),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db)
 ):
+    """Full-text search over titles, descriptions, summaries and translations"""
     try:
-        new_interaction = UserInteraction(
-            article_id=interaction["article_id"],
-            interaction_type=interaction["interaction_type"],
-            interaction_weight=1.0 if interaction["interaction_type"] == "view" else 2.0
+        results = await db.run_sync(
+            lambda session: search.search_articles(session, q, category, date_from, date_to, limit, offset)
         )
-        db.add(new_interaction)
-        db.commit()
-        return {"status": "success"}
+    except search.SearchUnavailable as e:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
     except Exception as e:
-        logger.error(f"Error recording interaction: {str(e)}")
+        logger.error(f"Error searching news: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to record interaction"
+            detail="Failed to search news"
         )
+    return {
+        "results": results,
+        "next_offset": offset + limit if len(results) == limit else None
+    }
+
+MAX_INTERACTION_BATCH = 500
+
+async def _enqueue_interactions(events: List[dict]):
+    try:
+        await interaction_buffer.submit(events)
+    except interaction_buffer.BufferFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Interaction buffer is full, retry shortly",
+            headers={"Retry-After": "1"}
+        )
+
+@router.post("/interaction")
+async def record_interaction(interaction: InteractionCreate):
+    # Buffered; written with the profile update in the next batched transaction
+    await _enqueue_interactions([interaction.model_dump()])
+    return {"status": "success"}
+
+@router.post("/interactions")
+async def record_interactions(batch: InteractionBatch):
+    if len(batch.interactions) > MAX_INTERACTION_BATCH:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {MAX_INTERACTION_BATCH} interactions per request"
+        )
+    await _enqueue_interactions([i.model_dump() for i in batch.interactions])
+    return {"status": "success", "accepted": len(batch.interactions)}
 
 @router.get("/recommended/{user_id}", response_model=List[NewsArticleResponse])
 async def get_recommended_news(
     user_id: str,
-    db: Session = Depends(get_db)
+    response: Response,
+    lang: Optional[str] = None,
+    collapse: bool = False,
+    db: AsyncSession = Depends(get_async_db)
 ):
     try:
-        # Get user's interaction history
-        interactions = db.query(UserInteraction).filter(
-            UserInteraction.user_id == user_id
-        ).all()
-        
-        # Get categories and sources the user has interacted with
-        user_categories = set()
-        user_sources = set()
-        
-        for interaction in interactions:
-            article = db.query(NewsArticle).filter(NewsArticle.id == interaction.article_id).first()
-            if article:
-                user_categories.add(article.category)
-                user_sources.add(article.source)
-        
-        # Get recent articles from user's preferred categories and sources
-        recommended_articles = []
-        if user_categories or user_sources:
-            articles_query = db.query(NewsArticle)
-            if user_categories:
-                articles_query = articles_query.filter(NewsArticle.category.in_(user_categories))
-            if user_sources:
-                articles_query = articles_query.filter(NewsArticle.source.in_(user_sources))
-            
-            recommended_articles = articles_query.order_by(NewsArticle.published_at.desc()).limit(10).all()
-        
-        # If no recommendations based on history, return latest news
-        if not recommended_articles:
-            recommended_articles = db.query(NewsArticle).order_by(
-                NewsArticle.published_at.desc()
-            ).limit(10).all()
-        
-        return recommended_articles
+        # Scored against the user's precomputed affinity profile; falls back to latest news
+        def recommend(session):
+            if not collapse:
+                return recommendations.recommend(session, user_id)
+            limit = recommendations.RECOMMENDATION_LIMIT
+            return dedup.collapse(session, recommendations.recommend(session, user_id, limit * COLLAPSE_OVERFETCH), limit)
+
+        return await with_translations(db, await db.run_sync(recommend), lang, response)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting recommended news: {str(e)}")
         raise HTTPException(
@@ -456,26 +299,76 @@ async def get_recommended_news(
             detail="Failed to get recommended news"
         )
 
+async def _cached_speech_response(path, range_header: Optional[str]) -> Response:
+    """Serve a cached MP3, honouring a single HTTP Range so replays can seek immediately"""
+    try:
+        body, byte_range, size = await tts.read_range(path, range_header)
+    except tts.RangeNotSatisfiable:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{path.stat().st_size}"}
+        )
+    headers = {
+        "Content-Disposition": "attachment; filename=speech.mp3",
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "public, max-age=86400",
+        "X-TTS-Key": path.stem,
+    }
+    if byte_range is None:
+        return Response(content=body, media_type="audio/mpeg", headers=headers)
+    first, last = byte_range
+    headers["Content-Range"] = f"bytes {first}-{last}/{size}"
+    return Response(
+        content=body,
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type="audio/mpeg",
+        headers=headers
+    )
+
 @router.post("/text-to-speech")
 async def get_speech(
+    request: Request,
     text: str = Body(...),
     language: str = Body("en")
 ):
     """Convert text to speech and return audio file"""
+    logger.info(f"Received text-to-speech request for language: {language}")
+    key = tts.cache_key(text, language)
+    path = tts.cached_path(key)
+    if path:
+        return await _cached_speech_response(path, request.headers.get("range"))
+
     try:
-        logger.info(f"Received text-to-speech request for language: {language}")
-        audio_data = await text_to_speech(text, language)
-        
-        return Response(
-            content=audio_data,
-            media_type="audio/mpeg",
-            headers={
-                "Content-Disposition": "attachment; filename=speech.mp3"
-            }
-        )
+        stream = tts.synthesize_stream(text, language)
+        # Pull the first chunk before responding so synthesis errors still become a 500
+        first_chunk = await stream.__anext__()
+    except StopAsyncIteration:
+        first_chunk = b""
     except Exception as e:
         logger.error(f"Error in text to speech endpoint: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        ) 
\ No newline at end of file
+            detail=f"Failed to convert text to speech: {str(e)}"
+        )
+
+    async def body():
+        yield first_chunk
+        async for chunk in stream:
+            yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type="audio/mpeg",
+        headers={
+            "Content-Disposition": "attachment; filename=speech.mp3",
+            "X-TTS-Key": key
+        }
+    )
+
+@router.get("/text-to-speech/{key}.mp3")
+async def get_cached_speech(key: str, request: Request):
+    """Replay previously synthesized audio (supports Range requests)"""
+    path = tts.cached_path(key)
+    if not path:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Audio not found")
+    return await _cached_speech_response(path, request.headers.get("range"))
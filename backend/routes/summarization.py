@@ -1,16 +1,22 @@
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 import httpx
 import os
-from dotenv import load_dotenv
+from backend import config  # noqa: F401  (loads .env)
 import logging
+import asyncio
+import json
+from backend.http_client import get_http_client
+from backend import llm_cache, groq_scheduler
+from backend.languages import LANGUAGE_NAMES
+from backend.text_extraction import extract_main_text, chunk_text, estimate_tokens
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-load_dotenv()
 
 router = APIRouter()
 
@@ -23,66 +29,110 @@ class TextResponse(BaseModel):
     summary: Optional[str] = None
     translation: Optional[str] = None
 
-async def call_groq_api(prompt: str, task_type: str = "translation") -> str:
+class BatchItem(BaseModel):
+    id: Optional[str] = None
+    text: str
+    max_length: int = 150
+    target_lang: str = "en"
+
+class BatchRequest(BaseModel):
+    items: List[BatchItem]
+
+class BatchItemResult(BaseModel):
+    id: Optional[str] = None
+    summary: Optional[str] = None
+    translation: Optional[str] = None
+    # task ("summarization" / "translation") -> why it failed; both can fail for one item
+    errors: Optional[Dict[str, str]] = None
+
+class BatchResponse(BaseModel):
+    results: List[BatchItemResult]
+
+def groq_model_for(task_type: str) -> str:
+    """Choose model based on task"""
+    if task_type == "translation":
+        return "llama-3.3-70b-versatile"  # More accurate model for translations
+    return "llama-3.1-8b-instant"  # Faster model for quick responses
+
+def groq_request(prompt: str, task_type: str, max_tokens: int = 1000) -> Tuple[dict, dict]:
+    """Chat completion payload and headers for a prompt"""
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        logger.error("GROQ_API_KEY not found in environment variables")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="GROQ_API_KEY not configured"
+        )
+
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+    data = {
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are a professional translator and summarizer. Provide ONLY the requested output without any explanations or notes."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "model": groq_model_for(task_type),
+        "temperature": 0.3,
+        "max_tokens": max_tokens,
+        "top_p": 0.9
+    }
+    return data, headers
+
+async def call_groq_api(prompt: str, task_type: str = "translation", cache_key: Optional[str] = None,
+                        max_tokens: int = 1000, json_output: bool = False,
+                        priority: int = groq_scheduler.PRIORITY_INTERACTIVE) -> str:
     """
     Call Groq API with a prompt and return the response
     task_type: either "translation" or "summarization" to optimize model choice
+    cache_key: optional llm_cache key; cached completions are returned without calling Groq
+    json_output: ask Groq for a JSON object response (used by packed batch prompts)
+    priority: scheduling priority; rate limits and retries are handled by groq_scheduler
     """
-    try:
-        api_key = os.getenv("GROQ_API_KEY")
-        if not api_key:
-            logger.error("GROQ_API_KEY not found in environment variables")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="GROQ_API_KEY not configured"
-            )
-
-        # Choose model based on task
-        model = "llama-3.1-8b-instant"  # Faster model for quick responses
-        if task_type == "translation":
-            model = "llama-3.3-70b-versatile"  # More accurate model for translations
+    if cache_key:
+        cached = await llm_cache.lookup(cache_key)
+        if cached is not None:
+            return cached
 
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
-        
-        data = {
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "You are a professional translator and summarizer. Provide ONLY the requested output without any explanations or notes."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "model": model,
-            "temperature": 0.3,
-            "max_tokens": 1000,
-            "top_p": 0.9
-        }
+    try:
+        data, headers = groq_request(prompt, task_type, max_tokens)
+        model = data["model"]
+        if json_output:
+            data["response_format"] = {"type": "json_object"}
         
         logger.info(f"Calling Groq API with model: {model}")
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                headers=headers,
-                json=data,
-                timeout=30.0
+        response = await groq_scheduler.post_chat_completion(data, headers, priority)
+        
+        if response.status_code == 200:
+            result = response.json()
+            content = result["choices"][0]["message"]["content"].strip()
+            if cache_key:
+                await llm_cache.store(cache_key, content, task_type, model)
+            return content
+        elif response.status_code == 429:
+            # Still rate limited after the scheduler's retries
+            logger.error("Groq API rate limit exceeded")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Groq API rate limit exceeded, please retry shortly",
+                headers={"Retry-After": response.headers.get("retry-after", "10")}
             )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result["choices"][0]["message"]["content"].strip()
-            else:
-                error_detail = response.json().get("error", {}).get("message", "Unknown error")
-                logger.error(f"Groq API error: {response.status_code} - {error_detail}")
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Groq API error: {error_detail}"
-                )
+        else:
+            error_detail = response.json().get("error", {}).get("message", "Unknown error")
+            logger.error(f"Groq API error: {response.status_code} - {error_detail}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Groq API error: {error_detail}"
+            )
+    except HTTPException:
+        raise
     except httpx.TimeoutException:
         logger.error("Request to Groq API timed out")
         raise HTTPException(
@@ -96,61 +146,93 @@ async def call_groq_api(prompt: str, task_type: str = "translation") -> str:
             detail=f"Error calling Groq API: {str(e)}"
         )
 
+# Long inputs are summarized map-reduce style: chunks of SUMMARY_CHUNK_TOKENS are summarized
+# concurrently (at most SUMMARY_CONCURRENCY at a time) and the partial summaries merged
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "2000"))
+SUMMARY_CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", "4"))
+SUMMARY_PARTIAL_LENGTH = int(os.getenv("SUMMARY_PARTIAL_LENGTH", "600"))
+URL_MAX_BYTES = int(os.getenv("URL_MAX_BYTES", str(2 * 1024 * 1024)))
+
+def language_name(target_lang: str) -> str:
+    return LANGUAGE_NAMES.get(target_lang.lower(), target_lang.upper())
+
+def summary_prompt(text: str, max_length: int) -> str:
+    return f"""Summarize the following text in about {max_length} characters:
+
+{text}
+
+Provide ONLY the summary, no additional text."""
+
+def translation_prompt(text: str, target_lang: str) -> str:
+    target_language = language_name(target_lang)
+    return f"""Translate this text to {target_language}. Maintain the original meaning and tone:
+
+{text}
+
+Provide ONLY the translation in {target_language}, no other text."""
+
+async def summarize_chunk(text: str, max_length: int) -> str:
+    return await call_groq_api(
+        summary_prompt(text, max_length),
+        "summarization",
+        cache_key=llm_cache.make_key(
+            text, "summarization", None,
+            groq_model_for("summarization"), max_length
+        )
+    )
+
+async def summarize_partials(chunks: List[str]) -> str:
+    """Map step: summarize chunks concurrently and join the partial summaries"""
+    logger.info(f"Summarizing long text in {len(chunks)} chunks")
+    semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+
+    async def map_chunk(chunk: str) -> str:
+        async with semaphore:
+            return await summarize_chunk(chunk, SUMMARY_PARTIAL_LENGTH)
+
+    partials = await asyncio.gather(*(map_chunk(chunk) for chunk in chunks))
+    return "\n\n".join(partials)
+
+async def summarize(text: str, max_length: int) -> str:
+    """Summarize text of any length, splitting it into concurrently summarized chunks if needed"""
+    chunks = chunk_text(text, SUMMARY_CHUNK_TOKENS)
+    if len(chunks) <= 1:
+        return await summarize_chunk(text, max_length)
+    # Reduce; recurses if the partial summaries themselves exceed one chunk
+    return await summarize(await summarize_partials(chunks), max_length)
+
+async def translate(text: str, target_lang: str) -> str:
+    return await call_groq_api(
+        translation_prompt(text, target_lang),
+        "translation",
+        cache_key=llm_cache.make_key(
+            text, "translation", target_lang,
+            groq_model_for("translation")
+        )
+    )
+
 @router.post("/text")
 async def process_text(request: TextRequest):
     try:
         # First, generate summary if text is longer than max_length
         summary = ""
         if len(request.text) > request.max_length:
-            summary_prompt = f"""Summarize the following text in about {request.max_length} characters:
-
-{request.text}
-
-Provide ONLY the summary, no additional text."""
-            
-            summary = await call_groq_api(summary_prompt, "summarization")
+            summary = await summarize(request.text, request.max_length)
 
         # Then, translate if target language is not English
         translation = ""
         if request.target_lang.lower() != "en":
-            language_prompts = {
-                'ar': 'Modern Standard Arabic',
-                'bn': 'Standard Bengali',
-                'zh': 'Simplified Chinese',
-                'fr': 'French',
-                'de': 'German',
-                'hi': 'Hindi',
-                'id': 'Indonesian',
-                'it': 'Italian',
-                'ja': 'Japanese',
-                'ko': 'Korean',
-                'pt': 'Portuguese',
-                'ru': 'Russian',
-                'es': 'Spanish',
-                'tr': 'Turkish'
-            }
-
-            target_language = language_prompts.get(
-                request.target_lang.lower(),
-                request.target_lang.upper()
-            )
-            
-            translation_prompt = f"""Translate this text to {target_language}. Maintain the original meaning and tone:
-
-{request.text}
-
-Provide ONLY the translation in {target_language}, no other text."""
-
-            translation = await call_groq_api(translation_prompt, "translation")
+            translation = await translate(request.text, request.target_lang)
 
         response = {
             "summary": summary if summary else None,
             "translation": translation if translation else None
         }
         
-        logger.info(f"Successfully processed text. Response: {response}")
         return response
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error processing text: {str(e)}")
         raise HTTPException(
@@ -158,18 +240,308 @@ Provide ONLY the translation in {target_language}, no other text."""
             detail=str(e)
         )
 
+# Streaming variant of /text: Groq is called with stream=true and tokens are relayed as
+# Server-Sent Events while they are generated. Completed outputs still fill llm_cache.
+async def stream_groq_api(prompt: str, task_type: str, cache_key: str) -> AsyncIterator[str]:
+    """Yield completion deltas; a cached completion is yielded as a single delta"""
+    cached = await llm_cache.lookup(cache_key)
+    if cached is not None:
+        yield cached
+        return
+
+    data, headers = groq_request(prompt, task_type)
+    logger.info(f"Streaming Groq API response with model: {data['model']}")
+    parts = []
+    async for delta in groq_scheduler.stream_chat_completion(data, headers, groq_scheduler.PRIORITY_INTERACTIVE):
+        parts.append(delta)
+        yield delta
+    content = "".join(parts).strip()
+    if content:
+        await llm_cache.store(cache_key, content, task_type, data["model"])
+
+async def stream_summary(text: str, max_length: int) -> AsyncIterator[str]:
+    """Long texts go through the map step first; only the final summary is streamed"""
+    chunks = chunk_text(text, SUMMARY_CHUNK_TOKENS)
+    while len(chunks) > 1:
+        text = await summarize_partials(chunks)
+        chunks = chunk_text(text, SUMMARY_CHUNK_TOKENS)
+    async for delta in stream_groq_api(
+        summary_prompt(text, max_length),
+        "summarization",
+        llm_cache.make_key(text, "summarization", None, groq_model_for("summarization"), max_length)
+    ):
+        yield delta
+
+def stream_translation(text: str, target_lang: str) -> AsyncIterator[str]:
+    return stream_groq_api(
+        translation_prompt(text, target_lang),
+        "translation",
+        llm_cache.make_key(text, "translation", target_lang, groq_model_for("translation"))
+    )
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def stream_error(e: Exception) -> dict:
+    if isinstance(e, HTTPException):
+        return {"status": e.status_code, "detail": e.detail}
+    if isinstance(e, groq_scheduler.GroqStreamError):
+        return {"status": e.status_code, "detail": f"Groq API error: {e.detail}"}
+    if isinstance(e, httpx.TimeoutException):
+        return {"status": status.HTTP_504_GATEWAY_TIMEOUT, "detail": "Request to Groq API timed out"}
+    return {"status": status.HTTP_500_INTERNAL_SERVER_ERROR, "detail": str(e)}
+
+@router.post("/text/stream")
+async def process_text_stream(request: TextRequest):
+    """
+    Server-Sent Events version of /text. Summary and translation are generated concurrently;
+    events are `summary` / `translation` with {"delta": ...}, then `summary_done` /
+    `translation_done` with the full text (or `error` with {"task", "status", "detail"}),
+    and finally `done`.
+    """
+    streams = {}
+    if len(request.text) > request.max_length:
+        streams["summary"] = stream_summary(request.text, request.max_length)
+    if request.target_lang.lower() != "en":
+        streams["translation"] = stream_translation(request.text, request.target_lang)
+
+    async def events():
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def pump(task: str, stream: AsyncIterator[str]):
+            try:
+                async for delta in stream:
+                    await queue.put((task, delta, None))
+                await queue.put((task, None, None))
+            except Exception as e:
+                logger.error(f"Streaming {task} failed: {str(e)}")
+                await queue.put((task, None, e))
+
+        pumps = [asyncio.create_task(pump(task, stream)) for task, stream in streams.items()]
+        texts = {task: [] for task in streams}
+        try:
+            remaining = len(pumps)
+            while remaining:
+                task, delta, error = await queue.get()
+                if error is not None:
+                    remaining -= 1
+                    yield sse_event("error", {"task": task, **stream_error(error)})
+                elif delta is None:
+                    remaining -= 1
+                    yield sse_event(f"{task}_done", {"text": "".join(texts[task]).strip()})
+                else:
+                    texts[task].append(delta)
+                    yield sse_event(task, {"delta": delta})
+            yield sse_event("done", {})
+        finally:
+            # Client went away: stop generating
+            for p in pumps:
+                p.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def fetch_url_text(url: str) -> str:
+    """Download a page (streamed, capped at URL_MAX_BYTES) and extract its main text"""
+    client = get_http_client()
+    async with client.stream("GET", url, follow_redirects=True) as response:
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=f"Fetching URL failed with status {response.status_code}"
+            )
+        declared = response.headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > URL_MAX_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Page exceeds {URL_MAX_BYTES} bytes"
+            )
+        body = bytearray()
+        async for chunk in response.aiter_bytes():
+            body.extend(chunk)
+            if len(body) > URL_MAX_BYTES:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Page exceeds {URL_MAX_BYTES} bytes"
+                )
+        encoding = response.encoding or "utf-8"
+
+    html = bytes(body).decode(encoding, errors="replace")
+    return extract_main_text(html)
+
 @router.post("/url")
-async def process_url(url: str):
+async def process_url(url: str, max_length: int = 150, target_lang: str = "en"):
     try:
-        # Fetch content from URL
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url)
-            text = response.text
-            
-        # Process the text content
-        return await process_text(TextRequest(text=text))
+        text = await fetch_url_text(url)
+        if not text:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="No article text found at URL"
+            )
+
+        summary = await summarize(text, max_length)
+        translation = None
+        if target_lang.lower() != "en":
+            translation = await translate(summary, target_lang)
+        return {"summary": summary or None, "translation": translation or None}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error processing URL: {str(e)}"
-        ) 
\ No newline at end of file
+        )
+
+# Batch endpoint: small inputs sharing a task (and max_length / language) are packed into one
+# prompt with JSON output; larger ones run as individual jobs. All run under BATCH_CONCURRENCY.
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "100"))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+BATCH_PACK_ITEM_TOKENS = int(os.getenv("BATCH_PACK_ITEM_TOKENS", "400"))
+BATCH_PACK_TOKENS = int(os.getenv("BATCH_PACK_TOKENS", "2000"))
+BATCH_PACK_MAX_ITEMS = int(os.getenv("BATCH_PACK_MAX_ITEMS", "10"))
+
+class _Job:
+    """One summary or translation of one batch item"""
+
+    def __init__(self, index: int, task: str, text: str, max_length: int = None, target_lang: str = None):
+        self.index = index
+        self.task = task
+        self.text = text
+        self.max_length = max_length
+        self.target_lang = target_lang
+        self.cache_key = llm_cache.make_key(
+            text, task, target_lang, groq_model_for(task),
+            max_length if task == "summarization" else None
+        )
+
+    @property
+    def group(self) -> tuple:
+        return (self.task, self.max_length, self.target_lang)
+
+def _packed_prompt(jobs: List["_Job"]) -> str:
+    task, max_length, target_lang = jobs[0].group
+    if task == "summarization":
+        instruction = f"Summarize each input text in about {max_length} characters."
+    else:
+        instruction = (
+            f"Translate each input text to {language_name(target_lang)}, "
+            "maintaining the original meaning and tone."
+        )
+    inputs = json.dumps([{"id": i, "text": job.text} for i, job in enumerate(jobs)], ensure_ascii=False)
+    return f"""{instruction}
+
+Inputs (JSON):
+{inputs}
+
+Respond with ONLY a JSON object of the form {{"results": [{{"id": <input id>, "output": "<result>"}}]}} containing one entry per input."""
+
+def _pack(jobs: List["_Job"]) -> List[List["_Job"]]:
+    """Group small jobs of the same kind into packs bounded by token count and item count"""
+    groups: Dict[tuple, List[_Job]] = {}
+    for job in jobs:
+        groups.setdefault(job.group, []).append(job)
+
+    packs = []
+    for group_jobs in groups.values():
+        current, tokens = [], 0
+        for job in group_jobs:
+            job_tokens = estimate_tokens(job.text)
+            if current and (tokens + job_tokens > BATCH_PACK_TOKENS or len(current) >= BATCH_PACK_MAX_ITEMS):
+                packs.append(current)
+                current, tokens = [], 0
+            current.append(job)
+            tokens += job_tokens
+        if current:
+            packs.append(current)
+    return packs
+
+async def _run_single(job: "_Job") -> str:
+    if job.task == "summarization":
+        return await summarize(job.text, job.max_length)
+    return await translate(job.text, job.target_lang)
+
+async def _run_pack(pack: List["_Job"]) -> Dict["_Job", Union[str, Exception]]:
+    """
+    One LLM call for a pack; jobs missing from the JSON answer are retried individually and
+    concurrently. Each job maps to its output, or to the exception its own call raised.
+    """
+    task = pack[0].task
+    results: Dict[_Job, Union[str, Exception]] = {}
+    if len(pack) > 1:
+        try:
+            raw = await call_groq_api(
+                _packed_prompt(pack),
+                task,
+                max_tokens=min(8000, 200 + sum(estimate_tokens(job.text) for job in pack) * 3),
+                json_output=True
+            )
+            for entry in json.loads(raw).get("results", []):
+                i = entry.get("id")
+                output = entry.get("output")
+                if isinstance(i, int) and 0 <= i < len(pack) and isinstance(output, str) and output.strip():
+                    results[pack[i]] = output.strip()
+        except Exception as e:
+            logger.warning(f"Packed {task} request for {len(pack)} items failed, falling back: {str(e)}")
+
+    await asyncio.gather(*(
+        llm_cache.store(job.cache_key, output, job.task, groq_model_for(job.task))
+        for job, output in results.items()
+    ))
+    missing = [job for job in pack if job not in results]
+    outputs = await asyncio.gather(*(_run_single(job) for job in missing), return_exceptions=True)
+    results.update(zip(missing, outputs))
+    return results
+
+@router.post("/batch", response_model=BatchResponse)
+async def process_batch(request: BatchRequest):
+    """Summarize/translate many texts in as few LLM calls as possible"""
+    if len(request.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {BATCH_MAX_ITEMS} items per batch"
+        )
+
+    results = [BatchItemResult(id=item.id) for item in request.items]
+    jobs = []
+    for index, item in enumerate(request.items):
+        if len(item.text) > item.max_length:
+            jobs.append(_Job(index, "summarization", item.text, max_length=item.max_length))
+        if item.target_lang.lower() != "en":
+            jobs.append(_Job(index, "translation", item.text, target_lang=item.target_lang.lower()))
+
+    def assign(job: _Job, output: str):
+        if job.task == "summarization":
+            results[job.index].summary = output or None
+        else:
+            results[job.index].translation = output or None
+
+    # Cache hits never reach Groq
+    pending = []
+    cached_outputs = await asyncio.gather(*(llm_cache.lookup(job.cache_key) for job in jobs))
+    for job, cached in zip(jobs, cached_outputs):
+        if cached is not None:
+            assign(job, cached)
+        else:
+            pending.append(job)
+
+    small = [job for job in pending if estimate_tokens(job.text) <= BATCH_PACK_ITEM_TOKENS]
+    large = [job for job in pending if estimate_tokens(job.text) > BATCH_PACK_ITEM_TOKENS]
+    units = _pack(small) + [[job] for job in large]
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run_unit(unit: List[_Job]):
+        async with semaphore:
+            for job, output in (await _run_pack(unit)).items():
+                if isinstance(output, Exception):
+                    detail = output.detail if isinstance(output, HTTPException) else str(output)
+                    result = results[job.index]
+                    result.errors = {**(result.errors or {}), job.task: detail}
+                else:
+                    assign(job, output)
+
+    await asyncio.gather(*(run_unit(unit) for unit in units))
+    logger.info(f"Processed batch of {len(request.items)} items with {len(units)} LLM jobs")
+    return {"results": results}
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, HttpUrl
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class UserBase(BaseModel):
@@ -43,13 +43,35 @@ class NewsArticleResponse(NewsArticleBase):
     published_at: datetime
     created_at: datetime
     user_id: Optional[int] = None
+    translation_lang: Optional[str] = None
 
     class Config:
         from_attributes = True
 
+class SavedNewsPage(BaseModel):
+    items: List[NewsArticleResponse]
+    next_cursor: Optional[str] = None
+
+class SearchResult(BaseModel):
+    article: NewsArticleResponse
+    snippet: str
+    score: float
+
+class SearchResponse(BaseModel):
+    results: List[SearchResult]
+    next_offset: Optional[int] = None
+
 class TextInput(BaseModel):
     text: str
     max_length: Optional[int] = 150
 
 class SummaryResponse(BaseModel):
-    summary: str 
\ No newline at end of file
+    summary: str
+
+class InteractionCreate(BaseModel):
+    article_id: int
+    interaction_type: str  # 'view' or 'click'
+    user_id: Optional[str] = None
+
+class InteractionBatch(BaseModel):
+    interactions: List[InteractionCreate]
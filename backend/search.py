@@ -0,0 +1,145 @@
+import logging
+import re
+import sys
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import DateTime, bindparam, inspect, text
+from sqlalchemy.orm import Session
+
+from backend.models import NewsArticle
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# External-content FTS5 index over the articles table; rowid is articles.id
+FTS_TABLE = "articles_fts"
+FTS_COLUMNS = ["title", "description", "summary", "translated_title", "translated_description"]
+# bm25 column weights, same order as FTS_COLUMNS
+FTS_WEIGHTS = [10.0, 4.0, 3.0, 5.0, 2.0]
+
+_columns = ", ".join(FTS_COLUMNS)
+_new_values = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+_old_values = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+
+FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        {_columns},
+        content='articles', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE ON articles BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+        INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.id, {_new_values});
+    END""",
+]
+
+
+class SearchUnavailable(Exception):
+    """Raised when the database has no FTS5 support (e.g. PostgreSQL)"""
+
+
+def is_supported(bind) -> bool:
+    return bind.dialect.name == "sqlite"
+
+
+def setup_search(engine):
+    """Create the FTS table and sync triggers; backfill it when created over existing rows"""
+    if not is_supported(engine):
+        logger.info("Full-text search requires SQLite FTS5; /api/news/search is disabled")
+        return
+    existed = inspect(engine).has_table(FTS_TABLE)
+    with engine.begin() as conn:
+        for statement in FTS_DDL:
+            conn.execute(text(statement))
+    if not existed:
+        rebuild_index(engine)
+
+
+def rebuild_index(engine):
+    """Re-index every stored article (for databases that predate the FTS table)"""
+    with engine.begin() as conn:
+        conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    logger.info("Full-text search index rebuilt")
+
+
+def to_match_query(q: str) -> str:
+    """
+    Turn free text into a safe FTS5 query: every word is quoted (so FTS syntax characters in
+    user input can't cause errors) and the last one is a prefix match for search-as-you-type.
+    """
+    terms = re.findall(r"\w+", q or "")
+    if not terms:
+        return ""
+    quoted = [f'"{t}"' for t in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def search_articles(db: Session, q: str, category: Optional[str] = None,
+                    date_from: Optional[datetime] = None, date_to: Optional[datetime] = None,
+                    limit: int = 20, offset: int = 0) -> List[dict]:
+    """BM25-ranked matches with highlighted snippets"""
+    if not is_supported(db.bind):
+        raise SearchUnavailable("Full-text search requires SQLite FTS5")
+
+    match = to_match_query(q)
+    if not match:
+        return []
+
+    filters = ""
+    params = {"match": match, "limit": limit, "offset": offset}
+    if category:
+        filters += (" AND EXISTS (SELECT 1 FROM article_categories c"
+                    " WHERE c.article_id = a.id AND c.category = :category)")
+        params["category"] = category.lower()
+    if date_from:
+        filters += " AND a.published_at >= :date_from"
+        params["date_from"] = date_from
+    if date_to:
+        filters += " AND a.published_at <= :date_to"
+        params["date_to"] = date_to
+
+    weights = ", ".join(str(w) for w in FTS_WEIGHTS)
+    statement = text(f"""
+        SELECT a.id AS id,
+               bm25({FTS_TABLE}, {weights}) AS score,
+               snippet({FTS_TABLE}, -1, '<mark>', '</mark>', '…', 16) AS snippet
+        FROM {FTS_TABLE}
+        JOIN articles a ON a.id = {FTS_TABLE}.rowid
+        WHERE {FTS_TABLE} MATCH :match{filters}
+        ORDER BY score
+        LIMIT :limit OFFSET :offset
+    """).bindparams(
+        *(bindparam(name, type_=DateTime) for name in ("date_from", "date_to") if name in params)
+    )
+    hits = db.execute(statement, params).all()
+    if not hits:
+        return []
+
+    articles = {
+        article.id: article
+        for article in db.query(NewsArticle).filter(NewsArticle.id.in_([hit.id for hit in hits])).all()
+    }
+    # bm25() is lower-is-better; flip the sign so clients see higher-is-better scores
+    return [
+        {"article": articles[hit.id], "snippet": hit.snippet, "score": -hit.score}
+        for hit in hits if hit.id in articles
+    ]
+
+
+if __name__ == "__main__":
+    from backend.database import Base, engine
+
+    if sys.argv[1:] != ["rebuild"]:
+        print("usage: python -m backend.search rebuild")
+        sys.exit(2)
+    Base.metadata.create_all(bind=engine)
+    setup_search(engine)
+    rebuild_index(engine)
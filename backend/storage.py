@@ -0,0 +1,134 @@
+import importlib.util
+import logging
+import os
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Connection pool (file SQLite and PostgreSQL)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+# Recycle server connections before proxies / PostgreSQL idle timeouts drop them
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+# SQLite pragmas applied to every new connection
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_CACHE_KB = int(os.getenv("SQLITE_CACHE_KB", "65536"))
+SQLITE_MMAP_BYTES = int(os.getenv("SQLITE_MMAP_BYTES", str(256 * 1024 * 1024)))
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+
+
+def _is_memory_sqlite(url) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def sqlite_pragmas(memory: bool = False) -> list:
+    pragmas = [
+        f"PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA cache_size = -{SQLITE_CACHE_KB}",
+        "PRAGMA temp_store = MEMORY",
+    ]
+    if not memory:
+        # WAL lets readers proceed while the ingestion/job writers commit; with WAL,
+        # synchronous=NORMAL is still crash-safe (only the last commits can be lost on power loss)
+        pragmas += [
+            "PRAGMA journal_mode = WAL",
+            f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}",
+            f"PRAGMA mmap_size = {SQLITE_MMAP_BYTES}",
+        ]
+    return pragmas
+
+
+# Async drivers used for the request path
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+
+def _install_sqlite_pragmas(engine: Engine, memory: bool):
+    pragmas = sqlite_pragmas(memory)
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+
+def _engine_options(url, **kwargs) -> dict:
+    if url.get_backend_name() == "sqlite":
+        options = {}
+        if url.get_driver_name() == "pysqlite":
+            options["connect_args"] = {"check_same_thread": False}
+        if not _is_memory_sqlite(url):
+            # SQLAlchemy would pick QueuePool for file databases anyway; size it explicitly.
+            # aiosqlite defaults to NullPool (a new thread + connection per checkout), so pool it too.
+            options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+            if url.get_driver_name() == "aiosqlite":
+                options["poolclass"] = AsyncAdaptedQueuePool
+    else:
+        options = {
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+            "pool_recycle": DB_POOL_RECYCLE,
+            "pool_pre_ping": True,
+        }
+    options.update(kwargs)
+    return options
+
+
+def create_engine_from_url(database_url: str, **kwargs) -> Engine:
+    """
+    Engine tuned for the database behind `database_url`:
+    SQLite gets WAL and the pragmas above on every connection plus an explicitly sized pool;
+    PostgreSQL gets a sized pool with pre-ping and connection recycling.
+    """
+    url = make_url(database_url)
+    engine = create_engine(url, **_engine_options(url, **kwargs))
+    if url.get_backend_name() == "sqlite":
+        _install_sqlite_pragmas(engine, _is_memory_sqlite(url))
+    return engine
+
+
+def async_url(database_url: str):
+    """The same database addressed through its asyncio driver (aiosqlite / asyncpg)"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend} databases")
+    driver = ASYNC_DRIVERS[backend]
+    if importlib.util.find_spec(driver) is None:
+        # Fail at startup rather than on the first request that touches the async engine
+        raise ValueError(f"DATABASE_URL uses {backend}, which needs the '{driver}' package for the "
+                         f"async engine: pip install {driver}")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+
+def create_async_engine_from_url(database_url: str, **kwargs) -> AsyncEngine:
+    """Async counterpart of create_engine_from_url with the same pool sizing and pragmas"""
+    url = async_url(database_url)
+    engine = create_async_engine(url, **_engine_options(url, **kwargs))
+    if url.get_backend_name() == "sqlite":
+        _install_sqlite_pragmas(engine.sync_engine, _is_memory_sqlite(url))
+    return engine
+
+
+def stats(engine: Engine) -> dict:
+    """Pool status and, for SQLite, the effective pragmas of a pooled connection"""
+    result = {"dialect": engine.dialect.name, "pool": engine.pool.status()}
+    if engine.dialect.name == "sqlite":
+        with engine.connect() as conn:
+            result["pragmas"] = {
+                name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+                for name in ("journal_mode", "synchronous", "busy_timeout", "cache_size", "temp_store", "mmap_size")
+            }
+    return result
@@ -0,0 +1,133 @@
+import re
+from html import unescape
+from html.parser import HTMLParser
+from typing import List
+
+# Elements whose content is never article text
+SKIP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe", "object",
+    "nav", "header", "footer", "aside", "form", "button", "select", "menu", "figure",
+}
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "li", "blockquote", "pre",
+    "h1", "h2", "h3", "h4", "h5", "h6", "td", "br", "tr",
+}
+CONTAINER_TAGS = {"article", "main"}
+VOID_TAGS = {"br", "hr", "img", "input", "meta", "link", "source", "wbr", "area", "base", "col", "embed", "param", "track"}
+
+# Blocks shorter than this are usually menus, bylines, share buttons...
+MIN_BLOCK_CHARS = 40
+# Rough characters-per-token ratio for English prose
+CHARS_PER_TOKEN = 4
+
+
+class _ArticleParser(HTMLParser):
+    """Collects text blocks, separately tracking those inside <article>/<main>"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.skip_depth = 0
+        self.container_depth = 0
+        self.title = ""
+        self._in_title = False
+        self._current: List[str] = []
+        self.blocks: List[str] = []
+        self.container_blocks: List[str] = []
+
+    def _end_block(self):
+        text = " ".join("".join(self._current).split())
+        self._current = []
+        if len(text) >= MIN_BLOCK_CHARS:
+            self.blocks.append(text)
+            if self.container_depth:
+                self.container_blocks.append(text)
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "title":
+            self._in_title = True
+        if tag in SKIP_TAGS and tag not in VOID_TAGS:
+            self.skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self._end_block()
+        if tag in CONTAINER_TAGS:
+            self.container_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        if tag in SKIP_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+        elif tag in BLOCK_TAGS:
+            self._end_block()
+        if tag in CONTAINER_TAGS and self.container_depth:
+            self.container_depth -= 1
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self.skip_depth:
+            self._current.append(data)
+
+    def close(self):
+        super().close()
+        self._end_block()
+
+
+def extract_main_text(html: str) -> str:
+    """
+    Strip markup and boilerplate from an HTML page and return the main article text as
+    paragraphs separated by blank lines. Prefers the content of <article>/<main> when present.
+    """
+    parser = _ArticleParser()
+    parser.feed(html or "")
+    parser.close()
+
+    container_text = sum(len(b) for b in parser.container_blocks)
+    blocks = parser.container_blocks if container_text >= 500 else parser.blocks
+    # Drop repeated blocks (cookie banners and "related stories" often appear twice)
+    seen = set()
+    unique = [b for b in blocks if not (b in seen or seen.add(b))]
+    if not unique:
+        # Not really HTML, or no paragraph markup at all
+        return " ".join(unescape(re.sub(r"<[^>]+>", " ", html or "")).split())
+    return "\n\n".join(unique)
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _split_sentences(paragraph: str) -> List[str]:
+    return [s for s in re.split(r"(?<=[.!?])\s+", paragraph) if s]
+
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """
+    Split text into chunks of at most ~max_tokens, breaking on paragraph boundaries and
+    falling back to sentences (then hard cuts) for oversized paragraphs.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    pieces = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for sentence in _split_sentences(paragraph):
+            while len(sentence) > max_chars:
+                pieces.append(sentence[:max_chars])
+                sentence = sentence[max_chars:]
+            pieces.append(sentence)
+
+    chunks, current, current_len = [], [], 0
+    for piece in pieces:
+        if current and current_len + len(piece) + 2 > max_chars:
+            chunks.append("\n\n".join(current))
+            current, current_len = [], 0
+        current.append(piece)
+        current_len += len(piece) + 2
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
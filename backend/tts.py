@@ -0,0 +1,182 @@
+import asyncio
+import hashlib
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Optional, Tuple
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# gTTS does blocking HTTP; it runs on this bounded pool instead of the event loop
+TTS_MAX_WORKERS = int(os.getenv("TTS_MAX_WORKERS", "4"))
+TTS_CACHE_DIR = Path(os.getenv("TTS_CACHE_DIR", "./tts_cache"))
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+TTS_CHUNK_SIZE = 64 * 1024
+
+# Map language codes to gTTS compatible codes
+LANG_MAP = {
+    'en': 'en',
+    'hi': 'hi',
+    'ar': 'ar',
+    'bn': 'bn',
+    'zh': 'zh-CN',
+    'fr': 'fr',
+    'de': 'de',
+    'id': 'id',
+    'it': 'it',
+    'ja': 'ja',
+    'ko': 'ko',
+    'pt': 'pt',
+    'ru': 'ru',
+    'es': 'es',
+    'tr': 'tr'
+}
+
+_executor = ThreadPoolExecutor(max_workers=TTS_MAX_WORKERS, thread_name_prefix="tts")
+_DONE = object()
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def tts_lang(lang: str) -> str:
+    """Get the correct language code or default to English"""
+    return LANG_MAP.get((lang or "en").lower(), 'en')
+
+
+def cache_key(text: str, lang: str) -> str:
+    return hashlib.sha256(f"{tts_lang(lang)}\n{text}".encode("utf-8")).hexdigest()
+
+
+def _path_for(key: str) -> Path:
+    return TTS_CACHE_DIR / f"{key}.mp3"
+
+
+def cached_path(key: str) -> Optional[Path]:
+    """Path of a cached MP3, refreshing its mtime so eviction stays least-recently-used"""
+    if not all(c in "0123456789abcdef" for c in key) or len(key) != 64:
+        return None
+    path = _path_for(key)
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        _stats["misses"] += 1
+        return None
+    _stats["hits"] += 1
+    return path
+
+
+def _enforce_cache_limit():
+    """Delete least recently used files until the cache fits in TTS_CACHE_MAX_BYTES"""
+    files = []
+    for path in TTS_CACHE_DIR.glob("*.mp3"):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        files.append((st.st_mtime, st.st_size, path))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= TTS_CACHE_MAX_BYTES:
+            break
+        try:
+            path.unlink()
+            total -= size
+            _stats["evictions"] += 1
+        except FileNotFoundError:
+            pass
+
+
+async def synthesize_stream(text: str, lang: str = 'en') -> AsyncIterator[bytes]:
+    """
+    Yield MP3 chunks as gTTS produces them. The audio is written to the disk cache at the
+    same time and published atomically once complete, even if the client disconnects early.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    key = cache_key(text, lang)
+    language = tts_lang(lang)
+    logger.info(f"Converting text to speech in language: {language}")
+
+    def produce():
+        # Imported on first synthesis rather than at startup; cache hits never need it
+        from gtts import gTTS
+
+        TTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = TTS_CACHE_DIR / f"{key}.{uuid.uuid4().hex}.part"
+        try:
+            with open(tmp, "wb") as fp:
+                for chunk in gTTS(text=text, lang=language, slow=False).stream():
+                    fp.write(chunk)
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            os.replace(tmp, _path_for(key))
+            _enforce_cache_limit()
+            loop.call_soon_threadsafe(queue.put_nowait, _DONE)
+        except Exception as e:
+            tmp.unlink(missing_ok=True)
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+
+    loop.run_in_executor(_executor, produce)
+    while True:
+        item = await queue.get()
+        if item is _DONE:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+
+async def synthesize(text: str, lang: str = 'en') -> bytes:
+    """Full MP3 for text, from the cache when available"""
+    path = cached_path(cache_key(text, lang))
+    if path:
+        return await asyncio.to_thread(path.read_bytes)
+    return b"".join([chunk async for chunk in synthesize_stream(text, lang)])
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single 'bytes=start-end' range; None means the whole file"""
+    if not range_header or not range_header.startswith("bytes="):
+        return None
+    spec = range_header[len("bytes="):].split(",")[0].strip()
+    start, _, end = spec.partition("-")
+    try:
+        if start == "":
+            # Suffix range: the last N bytes
+            length = int(end)
+            if length <= 0:
+                raise RangeNotSatisfiable(range_header)
+            return max(size - length, 0), size - 1
+        first = int(start)
+        last = int(end) if end else size - 1
+    except ValueError:
+        return None
+    if first >= size or last < first:
+        raise RangeNotSatisfiable(range_header)
+    return first, min(last, size - 1)
+
+
+def _read_slice(path: Path, first: int, last: int) -> bytes:
+    with open(path, "rb") as fp:
+        fp.seek(first)
+        return fp.read(last - first + 1)
+
+
+async def read_range(path: Path, range_header: Optional[str]) -> Tuple[bytes, Optional[Tuple[int, int]], int]:
+    """Returns (body, (first, last) or None for a full response, total size)"""
+    size = path.stat().st_size
+    byte_range = parse_range(range_header, size)
+    if byte_range is None:
+        return await asyncio.to_thread(path.read_bytes), None, size
+    first, last = byte_range
+    return await asyncio.to_thread(_read_slice, path, first, last), byte_range, size
+
+
+def stats() -> dict:
+    return {**_stats, "workers": TTS_MAX_WORKERS, "cache_dir": str(TTS_CACHE_DIR)}
@@ -0,0 +1,203 @@
+"""
+Concurrency benchmark for the async database path.
+
+Runs the app in-process and fires concurrent requests at /api/news/saved, which queries
+through the async session. It does the same against a baseline route with the old pattern:
+an `async def` handler making synchronous SQLAlchemy calls on the event loop. It reports
+throughput, latency percentiles and event-loop lag (how late a 10 ms timer fires while the
+load runs).
+
+    python benchmarks/async_db_benchmark.py --requests 2000 --concurrency 100 --io-latency-ms 2
+
+Local SQLite answers in microseconds, so --io-latency-ms adds a sleep to every SQL statement
+on the thread that executes it. This approximates the round trip to a networked database.
+
+The client shares the event loop with the app. The blocking path therefore runs each request
+to completion before the next one starts, and its per-request latencies hide the queueing.
+Compare req/s and loop lag: a blocked loop also stalls every other request, stream and
+background task in the process.
+
+By default a throwaway SQLite database is created and seeded. Pass --database-url to
+benchmark another database; bench rows are inserted into it.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--articles", type=int, default=5000, help="rows to seed")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--io-latency-ms", type=float, default=0.0,
+                        help="simulated per-statement database latency (SQLite only)")
+    parser.add_argument("--database-url", default=None)
+    return parser.parse_args()
+
+
+def configure_environment(args):
+    if not args.database_url:
+        path = os.path.join(tempfile.mkdtemp(prefix="news-bench-"), "bench.db")
+        args.database_url = f"sqlite:///{path}"
+    os.environ["DATABASE_URL"] = args.database_url
+    # Keep background work out of the measurement
+    os.environ["INGESTION_ENABLED"] = "false"
+    os.environ["JOB_WORKERS"] = "0"
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+
+
+def seed(count: int):
+    from backend.database import SessionLocal
+    from backend.models import NewsArticle
+
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        db.bulk_insert_mappings(NewsArticle, [
+            {
+                "title": f"Benchmark story {i}",
+                "description": f"Benchmark description {i} " * 8,
+                "url": f"https://bench.invalid/{now.timestamp()}/{i}",
+                "published_at": now - timedelta(minutes=i),
+                "created_at": now - timedelta(minutes=i),
+                "source": f"Source {i % 25}",
+                "category": "general",
+            }
+            for i in range(count)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def add_io_latency(latency_ms: float):
+    """Sleep on every statement, in whichever thread runs it (event loop or aiosqlite worker)"""
+    from sqlalchemy import event
+    from backend.database import engine, async_engine
+
+    delay = latency_ms / 1000
+
+    def trace(statement):
+        time.sleep(delay)
+
+    @event.listens_for(engine, "connect")
+    def sync_connect(dbapi_connection, connection_record):
+        dbapi_connection.set_trace_callback(trace)
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def async_connect(dbapi_connection, connection_record):
+        dbapi_connection.await_(dbapi_connection._connection.set_trace_callback(trace))
+
+
+def add_blocking_baseline(app):
+    """The pre-async handler shape: sync Session queries inside an async def"""
+    from backend.database import SessionLocal
+    from backend.models import NewsArticle
+    from backend.schemas import SavedNewsPage
+
+    @app.get("/bench/blocking-saved", response_model=SavedNewsPage)
+    async def blocking_saved(limit: int = 20):
+        db = SessionLocal()
+        try:
+            articles = db.query(NewsArticle).order_by(
+                NewsArticle.created_at.desc(), NewsArticle.id.desc()
+            ).limit(limit + 1).all()
+            return {"items": articles[:limit], "next_cursor": None}
+        finally:
+            db.close()
+
+
+async def measure_loop_lag(stop: asyncio.Event, samples: list):
+    interval = 0.01
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - started - interval)
+
+
+async def run_load(client, path: str, total: int, concurrency: int) -> dict:
+    latencies, errors = [], 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    lag, stop = [], asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop, lag))
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await lag_task
+
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+    return {
+        "rps": total / elapsed,
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "loop_lag_max_ms": max(lag, default=0) * 1000,
+        "loop_lag_mean_ms": statistics.mean(lag) * 1000 if lag else 0,
+        "errors": errors,
+    }
+
+
+async def main(args):
+    import httpx
+    from backend.main import app
+    from backend.database import async_engine
+
+    add_blocking_baseline(app)
+    if args.io_latency_ms:
+        from backend.database import engine
+        # Connections opened during seeding/startup don't have the hook
+        engine.dispose()
+        await async_engine.dispose()
+        add_io_latency(args.io_latency_ms)
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            paths = {
+                "blocking (sync session)": f"/bench/blocking-saved?limit={args.page_size}",
+                "async session": f"/api/news/saved?limit={args.page_size}",
+            }
+            for name, path in paths.items():
+                await run_load(client, path, min(args.concurrency, args.requests), args.concurrency)  # warm-up
+                results[name] = await run_load(client, path, args.requests, args.concurrency)
+    finally:
+        await async_engine.dispose()
+
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {args.articles} articles, "
+          f"+{args.io_latency_ms} ms/statement ({args.database_url})")
+    header = f"{'path':<26}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'lag max':>9}{'lag avg':>9}{'errors':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(f"{name:<26}{r['rps']:>9.1f}{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}"
+              f"{r['loop_lag_max_ms']:>9.2f}{r['loop_lag_mean_ms']:>9.2f}{r['errors']:>8}")
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    configure_environment(arguments)
+    import backend.main  # noqa: F401  (creates the schema)
+    seed(arguments.articles)
+    asyncio.run(main(arguments))
@@ -0,0 +1,162 @@
+"""
+Login throughput benchmark.
+
+Runs the app in-process, registers a few users, then fires concurrent logins at
+/api/auth/token, where bcrypt runs on the password hashing pool. It does the same against a
+baseline route that verifies on the event loop, as the login route used to. While each load
+runs, a probe requests /api/health every 50 ms. Its latency, counted from when each probe
+was due, shows how long other users wait behind bcrypt. Finally it measures /api/auth/me,
+which validates the JWT from the claims cache. It is not probed: in-process requests that
+never wait on I/O keep the loop busy on their own.
+
+    python benchmarks/auth_benchmark.py --requests 100 --concurrency 20
+
+Logins beyond PASSWORD_HASH_QUEUE_MAX get 503s; they are counted as rejected, not as errors.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100, help="logins per path")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--me-requests", type=int, default=5000)
+    return parser.parse_args()
+
+
+def configure_environment():
+    path = os.path.join(tempfile.mkdtemp(prefix="news-auth-bench-"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ["INGESTION_ENABLED"] = "false"
+    os.environ["JOB_WORKERS"] = "0"
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+
+
+def add_blocking_baseline(app):
+    """The previous login shape: bcrypt verify inside the async handler"""
+    from fastapi import Depends, HTTPException
+    from fastapi.security import OAuth2PasswordRequestForm
+    from sqlalchemy import select
+    from backend.database import get_async_db
+    from backend.models import User
+    from backend import passwords
+    from backend.routes.auth import create_access_token
+
+    @app.post("/bench/blocking-token")
+    async def blocking_login(form_data: OAuth2PasswordRequestForm = Depends(), db=Depends(get_async_db)):
+        user = await db.scalar(select(User).where(User.email == form_data.username))
+        if not user or not passwords.context().verify(form_data.password, user.hashed_password):
+            raise HTTPException(status_code=401)
+        return {"access_token": create_access_token({"sub": user.email}), "token_type": "bearer"}
+
+
+def pct(values: list, p: float) -> float:
+    return values[min(len(values) - 1, int(p * len(values)))] * 1000 if values else 0.0
+
+
+async def probe(client, stop: asyncio.Event, samples: list):
+    # Timed from when the request was due, so time spent waiting for a blocked loop counts
+    interval = 0.05
+    while not stop.is_set():
+        due = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        await client.get("/api/health")
+        samples.append(time.perf_counter() - due)
+
+
+async def run_load(client, request, total: int, concurrency: int, probed: bool = True) -> dict:
+    latencies, rejected, errors = [], 0, 0
+    remaining = iter(range(total))
+
+    async def worker():
+        nonlocal rejected, errors
+        for i in remaining:
+            started = time.perf_counter()
+            response = await request(i)
+            if response.status_code == 503:
+                rejected += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                errors += 1
+
+    probes, stop = [], asyncio.Event()
+    probe_task = asyncio.create_task(probe(client, stop, probes)) if probed else None
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    if probe_task:
+        await probe_task
+
+    latencies.sort()
+    probes.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": pct(latencies, 0.50),
+        "p95_ms": pct(latencies, 0.95),
+        "probe_p50_ms": pct(probes, 0.50),
+        "probe_max_ms": probes[-1] * 1000 if probes else 0.0,
+        "rejected": rejected,
+        "errors": errors,
+    }
+
+
+async def main(args):
+    import httpx
+    from backend.main import app
+    from backend.database import async_engine
+    from backend import passwords
+
+    add_blocking_baseline(app)
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+            emails = [f"bench{i}@example.com" for i in range(args.users)]
+            for email in emails:
+                response = await client.post("/api/auth/register", json={
+                    "email": email, "full_name": "Bench User", "password": "bench-password"})
+                response.raise_for_status()
+
+            def login(path):
+                return lambda i: client.post(path, data={"username": emails[i % len(emails)],
+                                                         "password": "bench-password"})
+
+            results["blocking (on loop)"] = await run_load(
+                client, login("/bench/blocking-token"), args.requests, args.concurrency)
+            results["hashing pool"] = await run_load(
+                client, login("/api/auth/token"), args.requests, args.concurrency)
+
+            token = (await login("/api/auth/token")(0)).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+            results["/me (cached claims)"] = await run_load(
+                client, lambda i: client.get("/api/auth/me", headers=headers), args.me_requests, args.concurrency,
+                probed=False)
+    finally:
+        await async_engine.dispose()
+
+    print(f"{args.requests} logins, concurrency {args.concurrency}, "
+          f"{passwords.PASSWORD_HASH_WORKERS} hashing workers, queue max {passwords.PASSWORD_HASH_QUEUE_MAX}")
+    header = (f"{'path':<22}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}"
+              f"{'probe p50':>11}{'probe max':>11}{'503s':>7}{'errors':>8}")
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(f"{name:<22}{r['rps']:>9.1f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}"
+              f"{r['probe_p50_ms']:>11.1f}{r['probe_max_ms']:>11.1f}{r['rejected']:>7}{r['errors']:>8}")
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    configure_environment()
+    asyncio.run(main(arguments))
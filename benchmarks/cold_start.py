@@ -0,0 +1,116 @@
+"""
+Cold-start benchmark.
+
+Boots `uvicorn backend.main:app` repeatedly against one throwaway database. For each boot it
+measures the time from spawning the process to the first successful response, then reads
+/api/health/startup for the phase breakdown: imports, schema, app_ready and first_response,
+each counted from process start. The first boot creates the schema; later boots should
+skip it because the schema version matches.
+
+    python benchmarks/cold_start.py --runs 5 --budget 3.0
+    python benchmarks/cold_start.py --importtime   # slowest imports, from python -X importtime
+
+Exits 1 when the median warm boot exceeds --budget seconds (default STARTUP_BUDGET_SECONDS).
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="boots, the first one against an empty database")
+    parser.add_argument("--port", type=int, default=8902)
+    parser.add_argument("--path", default="/api/health", help="request whose response ends the boot")
+    parser.add_argument("--budget", type=float, default=float(os.getenv("STARTUP_BUDGET_SECONDS", "0")))
+    parser.add_argument("--importtime", action="store_true", help="list the slowest imports of backend.main")
+    parser.add_argument("--top", type=int, default=20)
+    return parser.parse_args()
+
+
+def environment(workdir: str) -> dict:
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'cold.db')}")
+    # Background work would only add noise to the boot
+    env["INGESTION_ENABLED"] = "false"
+    env["JOB_WORKERS"] = "0"
+    return env
+
+
+def boot(args, env: dict) -> dict:
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(args.port), "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{args.port}", timeout=5) as client:
+            while True:
+                if process.poll() is not None:
+                    raise SystemExit(f"Server exited with status {process.returncode} during startup")
+                try:
+                    if client.get(args.path).status_code < 500:
+                        break
+                except httpx.TransportError:
+                    time.sleep(0.01)
+            wall = time.perf_counter() - started
+            report = client.get("/api/health/startup").json()
+    finally:
+        process.terminate()
+        process.wait(timeout=15)
+    return {"wall": wall, **report}
+
+
+def print_importtime(env: dict, top: int):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import backend.main"],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    rows = []
+    # Lines look like "import time:   self [us] |   cumulative | imported package"
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((int(cumulative_us), int(self_us), name))
+    print(f"Slowest imports (cumulative ms, self ms), top {top}:")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>9.1f}{self_us / 1000:>9.1f}  {name}")
+    print()
+
+
+def main(args) -> int:
+    env = environment(tempfile.mkdtemp(prefix="news-cold-"))
+    if args.importtime:
+        print_importtime(env, args.top)
+
+    header = f"{'boot':<6}{'wall s':>9}{'imports':>9}{'schema':>9}{'ready':>9}{'first':>9}  schema sync"
+    print(header)
+    print("-" * len(header))
+    warm = []
+    for run in range(args.runs):
+        result = boot(args, env)
+        phases = result["phases"]
+        print(f"{run + 1:<6}{result['wall']:>9.3f}{phases.get('imports', 0):>9.3f}{phases.get('schema', 0):>9.3f}"
+              f"{phases.get('app_ready', 0):>9.3f}{phases.get('first_response', 0):>9.3f}  {result['schema_synced']}")
+        if run:
+            warm.append(result["wall"])
+
+    if not warm:
+        return 0
+    median = statistics.median(warm)
+    print(f"\nMedian warm boot to first response: {median:.3f}s")
+    if args.budget and median > args.budget:
+        print(f"FAIL over the {args.budget:.3f}s startup budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(parse_args()))
@@ -0,0 +1,301 @@
+"""
+Mixed-traffic load test against local stand-ins for NewsAPI, Groq and gTTS.
+
+Starts benchmarks/mock_upstreams.py and the app (benchmarks/run_app.py, throwaway database)
+as subprocesses, waits for ingestion to fill the feed, then drives a weighted mix of feed
+reads, interactions, summaries and text-to-speech at a fixed concurrency:
+
+    python benchmarks/load_test.py --duration 60 --concurrency 50 --output benchmarks/results/run.json
+
+Throughput, error count and p50/p95/p99 latency are reported per endpoint and written as
+JSON. The run fails (exit 1) when it breaks benchmarks/thresholds.json or, with --baseline,
+when p95 or throughput regress by more than --max-regression against an earlier result file.
+
+Upstream latency and error injection are passed through to the mock, e.g.
+--groq-latency 800 --groq-error-rate 0.1. Use --app-url to load an already running app
+(its upstreams are then whatever it was configured with).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCH_DIR = os.path.join(ROOT, "benchmarks")
+
+CATEGORIES = ["business", "technology", "sports", "science", "health", "entertainment", "general"]
+DEFAULT_MIX = "latest=30,category=20,recommended=10,saved=10,interaction=15,summarize=10,tts=5"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mixed-traffic load test with mock upstreams")
+    parser.add_argument("--duration", type=float, default=30, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="unmeasured seconds before the run")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="endpoint=weight pairs")
+    parser.add_argument("--users", type=int, default=200, help="distinct user ids")
+    parser.add_argument("--texts", type=int, default=100,
+                        help="distinct summarize/TTS inputs (repeats hit the LLM and TTS caches)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--app-port", type=int, default=8900)
+    parser.add_argument("--mock-port", type=int, default=8901)
+    parser.add_argument("--app-url", default=None, help="load an already running app instead")
+    parser.add_argument("--output", default=None, help="write results JSON here")
+    parser.add_argument("--thresholds", default=os.path.join(BENCH_DIR, "thresholds.json"))
+    parser.add_argument("--baseline", default=None, help="earlier results JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="allowed fractional p95 increase / throughput drop vs --baseline")
+    for service in ("groq", "newsapi", "tts"):
+        parser.add_argument(f"--{service}-latency", type=float, default=None)
+        parser.add_argument(f"--{service}-jitter", type=float, default=None)
+        parser.add_argument(f"--{service}-error-rate", type=float, default=None)
+    return parser.parse_args(argv)
+
+
+def parse_mix(mix: str) -> dict:
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise SystemExit(f"Unknown endpoint in --mix: {name}")
+        weights[name.strip()] = float(weight)
+    return weights
+
+
+# Scenarios: each takes (client, state, rng) and returns the response
+
+async def latest(client, state, rng):
+    return await client.get("/api/news/latest")
+
+
+async def category(client, state, rng):
+    return await client.get(f"/api/news/category/{rng.choice(CATEGORIES)}")
+
+
+async def recommended(client, state, rng):
+    return await client.get(f"/api/news/recommended/user-{rng.randrange(state['users'])}")
+
+
+async def saved(client, state, rng):
+    return await client.get("/api/news/saved", params={"limit": 20})
+
+
+async def interaction(client, state, rng):
+    return await client.post("/api/news/interaction", json={
+        "article_id": rng.choice(state["article_ids"]),
+        "interaction_type": rng.choice(("view", "view", "click")),
+        "user_id": f"user-{rng.randrange(state['users'])}",
+    })
+
+
+def _text(n: int) -> str:
+    return (f"Article {n}. " + "The council approved the new budget after a long debate about transit, "
+            "schools and housing, and analysts expect the changes to take effect next year. " * 6)
+
+
+async def summarize(client, state, rng):
+    return await client.post("/api/summarize/text", json={
+        "text": _text(rng.randrange(state["texts"])), "max_length": 150,
+        "target_lang": rng.choice(("en", "en", "es")),
+    })
+
+
+async def tts(client, state, rng):
+    return await client.post("/api/news/text-to-speech", json={
+        "text": f"Headline number {rng.randrange(state['texts'])}: markets closed higher today.",
+        "language": "en",
+    })
+
+
+SCENARIOS = {
+    "latest": latest,
+    "category": category,
+    "recommended": recommended,
+    "saved": saved,
+    "interaction": interaction,
+    "summarize": summarize,
+    "tts": tts,
+}
+
+
+def start_servers(args) -> list:
+    mock_args = [sys.executable, os.path.join(BENCH_DIR, "mock_upstreams.py"), "--port", str(args.mock_port)]
+    for service in ("groq", "newsapi", "tts"):
+        for option in ("latency", "jitter", "error_rate"):
+            value = getattr(args, f"{service}_{option}")
+            if value is not None:
+                mock_args += [f"--{service}-{option.replace('_', '-')}", str(value)]
+    upstream = f"http://127.0.0.1:{args.mock_port}"
+    app_args = [sys.executable, os.path.join(BENCH_DIR, "run_app.py"),
+                "--port", str(args.app_port), "--upstream", upstream]
+    return [subprocess.Popen(mock_args, cwd=ROOT), subprocess.Popen(app_args, cwd=ROOT)]
+
+
+def stop_servers(processes: list):
+    for process in reversed(processes):
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def wait_for_feed(client, timeout: float = 60) -> list:
+    """Wait until the app answers and ingestion has stored articles; return their ids"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            response = await client.get("/api/news/latest")
+            if response.status_code == 200 and response.json():
+                return [article["id"] for article in response.json()]
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.5)
+    raise SystemExit("App did not serve any articles within the startup timeout")
+
+
+def percentile(values: list, p: float) -> float:
+    return values[min(len(values) - 1, int(p * len(values)))] if values else 0.0
+
+
+def summarize_samples(samples: list, elapsed: float) -> dict:
+    latencies = sorted(latency for latency, ok in samples)
+    errors = sum(1 for latency, ok in samples if not ok)
+    return {
+        "count": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "rps": round(len(samples) / elapsed, 2),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+    }
+
+
+async def drive(client, state, weights: dict, concurrency: int, seconds: float, seed: int) -> dict:
+    names, cumulative = list(weights), list(weights.values())
+    samples = {name: [] for name in names}
+    deadline = time.monotonic() + seconds
+
+    async def worker(index: int):
+        rng = random.Random(seed * 1000 + index)
+        while time.monotonic() < deadline:
+            name = rng.choices(names, cumulative)[0]
+            started = time.perf_counter()
+            try:
+                response = await SCENARIOS[name](client, state, rng)
+                await response.aread()
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            samples[name].append((time.perf_counter() - started, ok))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    endpoints = {name: summarize_samples(s, elapsed) for name, s in samples.items() if s}
+    total = summarize_samples([sample for s in samples.values() for sample in s], elapsed)
+    return {"elapsed_s": round(elapsed, 2), "endpoints": endpoints, "total": total}
+
+
+def check(results: dict, thresholds: dict, baseline: dict, max_regression: float) -> list:
+    failures = []
+    rows = {**results["endpoints"], "total": results["total"]}
+    for name, limits in thresholds.items():
+        row = rows.get(name)
+        if row is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "error_rate"):
+            if metric in limits and row[metric] > limits[metric]:
+                failures.append(f"{name}: {metric} {row[metric]} > {limits[metric]}")
+        if "min_rps" in limits and row["rps"] < limits["min_rps"]:
+            failures.append(f"{name}: rps {row['rps']} < {limits['min_rps']}")
+    if baseline:
+        previous = {**baseline["endpoints"], "total": baseline["total"]}
+        for name, row in rows.items():
+            before = previous.get(name)
+            if not before:
+                continue
+            if before["p95_ms"] and row["p95_ms"] > before["p95_ms"] * (1 + max_regression):
+                failures.append(f"{name}: p95 {row['p95_ms']} ms vs baseline {before['p95_ms']} ms")
+            if name == "total" and row["rps"] < before["rps"] * (1 - max_regression):
+                failures.append(f"total: {row['rps']} req/s vs baseline {before['rps']} req/s")
+    return failures
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def print_table(results: dict):
+    header = f"{'endpoint':<14}{'count':>8}{'errors':>8}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, r in [*results["endpoints"].items(), ("total", results["total"])]:
+        print(f"{name:<14}{r['count']:>8}{r['errors']:>8}{r['rps']:>9.1f}"
+              f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}")
+
+
+async def main(args) -> int:
+    weights = parse_mix(args.mix)
+    processes = [] if args.app_url else start_servers(args)
+    base_url = args.app_url or f"http://127.0.0.1:{args.app_port}"
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            state = {"article_ids": await wait_for_feed(client), "users": args.users, "texts": args.texts}
+            if args.warmup:
+                await drive(client, state, weights, args.concurrency, args.warmup, args.seed + 1)
+            results = await drive(client, state, weights, args.concurrency, args.duration, args.seed)
+    finally:
+        stop_servers(processes)
+
+    results["meta"] = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "duration_s": args.duration,
+        "concurrency": args.concurrency,
+        "mix": weights,
+        "upstreams": {
+            service: {option: getattr(args, f"{service}_{option}") for option in ("latency", "jitter", "error_rate")}
+            for service in ("groq", "newsapi", "tts")
+        },
+    }
+    print(f"{args.duration:.0f}s at concurrency {args.concurrency} ({results['meta']['revision'] or 'no git'})")
+    print_table(results)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    thresholds = {}
+    if args.thresholds and os.path.exists(args.thresholds):
+        with open(args.thresholds) as f:
+            thresholds = json.load(f)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    failures = check(results, thresholds, baseline, args.max_regression)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
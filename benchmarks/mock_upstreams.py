@@ -0,0 +1,185 @@
+"""
+Local stand-ins for the external services, for load tests:
+
+    POST /openai/v1/chat/completions             Groq (plain and stream=true)
+    GET  /v2/top-headlines                       NewsAPI
+    POST /_/TranslateWebserverUi/data/batchexecute   Google Translate TTS, as called by gTTS
+
+Each service has its own latency (mean and jitter, in ms) and error rate:
+
+    python benchmarks/mock_upstreams.py --port 8901 --groq-latency 400 --groq-error-rate 0.05
+
+Groq errors are 429s with Retry-After, as under real rate limiting; the other services return 500s.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import random
+import re
+import time
+from datetime import datetime, timedelta, timezone
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+app = FastAPI(title="Mock upstreams")
+
+CONFIG = {
+    "groq": {"latency": 300.0, "jitter": 100.0, "error_rate": 0.0},
+    "newsapi": {"latency": 150.0, "jitter": 50.0, "error_rate": 0.0},
+    "tts": {"latency": 200.0, "jitter": 50.0, "error_rate": 0.0},
+    # Per-token delay for streamed Groq responses
+    "groq_token_ms": 5.0,
+}
+STATS = {"groq": 0, "newsapi": 0, "tts": 0, "errors": 0}
+# ~4 KB of MPEG-ish bytes per TTS call
+FAKE_MP3 = b"\xff\xfb\x90\x64" + bytes(range(256)) * 16
+
+TOPICS = ["markets", "elections", "climate", "chips", "football", "vaccines", "space", "housing"]
+OUTLETS = ["Reuters", "AP News", "BBC News", "The Verge", "Bloomberg"]
+
+
+def headline_pool(category: str, page_size: int, page: int) -> list:
+    """
+    Deterministic headlines with a few syndicated near-duplicates per page (same story,
+    different outlet) so clustering and the follower delay are exercised. A fresh batch
+    appears every minute, like a live feed.
+    """
+    minute = int(time.time() // 60)
+    now = datetime.now(timezone.utc)
+    articles = []
+    for i in range(page_size):
+        n = (page - 1) * page_size + i
+        story = n - n % 3 if n % 5 == 0 else n
+        topic = TOPICS[story % len(TOPICS)]
+        articles.append({
+            "source": {"id": None, "name": OUTLETS[n % len(OUTLETS)]},
+            "author": "Mock Reporter",
+            "title": f"{category.title()} update on {topic}: story {minute}-{story} - {OUTLETS[n % len(OUTLETS)]}",
+            "description": f"Officials and analysts weighed in on {topic} as story {story} developed "
+                           f"in the {category} section, with more details expected later today.",
+            "url": f"https://mock.invalid/{category}/{minute}/{n}",
+            "urlToImage": None,
+            "publishedAt": (now - timedelta(minutes=n)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "content": f"Full text of {category} story {story} about {topic}. " * 10,
+        })
+    return articles
+
+
+async def _delay(service: str):
+    settings = CONFIG[service]
+    latency = max(0.0, random.gauss(settings["latency"], settings["jitter"]))
+    await asyncio.sleep(latency / 1000)
+
+
+def _should_fail(service: str) -> bool:
+    if random.random() < CONFIG[service]["error_rate"]:
+        STATS["errors"] += 1
+        return True
+    return False
+
+
+def _completion_text(prompt: str) -> str:
+    words = prompt.split()
+    # Roughly what a summary / translation looks like: a shortened echo of the input
+    return " ".join(words[-min(len(words), 40):]) or "ok"
+
+
+@app.post("/openai/v1/chat/completions")
+async def chat_completions(request: Request):
+    STATS["groq"] += 1
+    body = await request.json()
+    await _delay("groq")
+    if _should_fail("groq"):
+        return JSONResponse(
+            {"error": {"message": "Rate limit reached (mock)", "type": "tokens"}},
+            status_code=429, headers={"retry-after": "1"}
+        )
+
+    prompt = body["messages"][-1]["content"]
+    if body.get("response_format", {}).get("type") == "json_object":
+        ids = [int(i) for i in re.findall(r'"id": (\d+)', prompt)]
+        text = json.dumps({"results": [{"id": i, "output": f"output {i}"} for i in ids]})
+    else:
+        text = _completion_text(prompt)
+    prompt_tokens = sum(len(m.get("content", "")) for m in body["messages"]) // 4
+    usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(text) // 4,
+             "total_tokens": prompt_tokens + len(text) // 4}
+    headers = {"x-ratelimit-remaining-requests": "1000", "x-ratelimit-remaining-tokens": "1000000"}
+
+    if body.get("stream"):
+        async def events():
+            for word in text.split(" "):
+                await asyncio.sleep(CONFIG["groq_token_ms"] / 1000)
+                yield f"data: {json.dumps({'choices': [{'delta': {'content': word + ' '}}]})}\n\n"
+            yield f"data: {json.dumps({'choices': [{'delta': {}}], 'x_groq': {'usage': usage}})}\n\n"
+            yield "data: [DONE]\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
+
+    return JSONResponse({
+        "id": f"mock-{time.time_ns()}",
+        "model": body.get("model"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+        "usage": usage,
+    }, headers=headers)
+
+
+@app.get("/v2/top-headlines")
+async def top_headlines(request: Request):
+    STATS["newsapi"] += 1
+    await _delay("newsapi")
+    if _should_fail("newsapi"):
+        return JSONResponse({"status": "error", "code": "unexpectedError", "message": "mock failure"}, status_code=500)
+    params = request.query_params
+    articles = headline_pool(
+        params.get("category") or "general",
+        int(params.get("pageSize") or 20),
+        int(params.get("page") or 1),
+    )
+    return {"status": "ok", "totalResults": len(articles), "articles": articles}
+
+
+@app.post("/_/TranslateWebserverUi/data/batchexecute")
+async def tts_batchexecute():
+    STATS["tts"] += 1
+    await _delay("tts")
+    if _should_fail("tts"):
+        return PlainTextResponse("mock failure", status_code=500)
+    audio = base64.b64encode(FAKE_MP3).decode("ascii")
+    # Same envelope gTTS parses: a line containing jQ1olc","[\"<base64 audio>\"]
+    return PlainTextResponse(f')]}}\'\n\n[["wrb.fr","jQ1olc","[\\"{audio}\\"]",null,null,null,"generic"]]\n')
+
+
+@app.get("/_stats")
+async def stats():
+    return STATS
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mock NewsAPI / Groq / gTTS upstreams")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8901)
+    for service in ("groq", "newsapi", "tts"):
+        parser.add_argument(f"--{service}-latency", type=float, default=CONFIG[service]["latency"], help="mean ms")
+        parser.add_argument(f"--{service}-jitter", type=float, default=CONFIG[service]["jitter"], help="stddev ms")
+        parser.add_argument(f"--{service}-error-rate", type=float, default=CONFIG[service]["error_rate"])
+    parser.add_argument("--groq-token-ms", type=float, default=CONFIG["groq_token_ms"])
+    return parser.parse_args(argv)
+
+
+def configure(args):
+    for service in ("groq", "newsapi", "tts"):
+        CONFIG[service] = {
+            "latency": getattr(args, f"{service}_latency"),
+            "jitter": getattr(args, f"{service}_jitter"),
+            "error_rate": getattr(args, f"{service}_error_rate"),
+        }
+    CONFIG["groq_token_ms"] = args.groq_token_ms
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    configure(arguments)
+    uvicorn.run(app, host=arguments.host, port=arguments.port, log_level="warning")
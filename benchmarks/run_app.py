@@ -0,0 +1,55 @@
+"""
+Run the app against the mock upstreams (benchmarks/mock_upstreams.py) instead of the real
+NewsAPI, Groq and Google Translate TTS:
+
+    python benchmarks/run_app.py --port 8900 --upstream http://127.0.0.1:8901
+
+A throwaway SQLite database and TTS cache directory are used unless DATABASE_URL /
+TTS_CACHE_DIR are already set. Groq quotas default to values that don't throttle the mock.
+Every other setting is read from the environment as usual.
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the API against mock upstreams")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--upstream", default="http://127.0.0.1:8901", help="mock_upstreams.py base URL")
+    return parser.parse_args(argv)
+
+
+def configure_environment(upstream: str):
+    workdir = tempfile.mkdtemp(prefix="news-load-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'load.db')}")
+    os.environ.setdefault("TTS_CACHE_DIR", os.path.join(workdir, "tts_cache"))
+    os.environ["NEWSAPI_BASE_URL"] = f"{upstream}/v2"
+    os.environ["GROQ_API_URL"] = f"{upstream}/openai/v1/chat/completions"
+    os.environ.setdefault("NEWS_API_KEY", "mock")
+    os.environ.setdefault("GROQ_API_KEY", "mock")
+    os.environ.setdefault("GROQ_RPM", "100000")
+    os.environ.setdefault("GROQ_TPM", "100000000")
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+
+
+def patch_gtts(upstream: str):
+    # gTTS builds https://translate.google.<tld>/<path>; send it to the mock instead
+    import gtts.tts
+    gtts.tts._translate_url = lambda tld="com", path="": f"{upstream}/{path}"
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    configure_environment(arguments.upstream)
+    patch_gtts(arguments.upstream)
+
+    import uvicorn
+    from backend.main import app
+
+    uvicorn.run(app, host=arguments.host, port=arguments.port, log_level="warning")
@@ -0,0 +1,41 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend import ingestion, storage
+from backend.database import Base
+from backend.routes import news
+
+STORY = {"title": "Markets rally", "description": "Stocks rose", "url": "http://example.com/rally",
+         "publishedAt": "2025-04-19T10:00:00Z", "source": {"name": "Wire"}}
+
+
+def test_story_in_two_categories_is_listed_in_both_feeds(tmp_path):
+    url = f"sqlite:///{tmp_path / 'feeds.db'}"
+    engine = storage.create_engine_from_url(url)
+    Base.metadata.create_all(bind=engine)
+
+    linked = {}
+    with Session(engine) as db:
+        for category in ("business", "general"):
+            all_ids, _ = ingestion.bulk_upsert_articles(db, [STORY], category)
+            linked[category] = ingestion.link_category(db, all_ids, category)
+            db.commit()
+        # Re-ingesting the same headline changes nothing
+        all_ids, new_ids = ingestion.bulk_upsert_articles(db, [STORY], "general")
+        assert new_ids == []
+        assert ingestion.link_category(db, all_ids, "general") == []
+    assert linked["business"] == linked["general"] == all_ids
+
+    async def feeds():
+        async_engine = storage.create_async_engine_from_url(url)
+        try:
+            async with AsyncSession(async_engine) as db:
+                return {category: [a.url for a in await news._category_feed(category, db, False)]
+                        for category in ("business", "general", "sports")}
+        finally:
+            await async_engine.dispose()
+
+    assert asyncio.run(feeds()) == {"business": [STORY["url"]], "general": [STORY["url"]], "sports": []}
+    engine.dispose()
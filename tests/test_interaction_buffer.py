@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from backend import interaction_buffer
+
+
+def events(count: int) -> list:
+    return [{"article_id": i, "interaction_type": "view", "user_id": "u"} for i in range(count)]
+
+
+@pytest.fixture
+def small_buffer(monkeypatch):
+    monkeypatch.setattr(interaction_buffer, "INTERACTION_ENQUEUE_TIMEOUT", 0.05)
+    monkeypatch.setattr(interaction_buffer, "_queue", None)
+    monkeypatch.setattr(interaction_buffer, "INTERACTION_QUEUE_MAX", 5)
+    yield
+    monkeypatch.setattr(interaction_buffer, "_queue", None)
+
+
+def test_batch_that_does_not_fit_is_not_partially_queued(small_buffer):
+    async def run():
+        await interaction_buffer.submit(events(3))
+        with pytest.raises(interaction_buffer.BufferFull):
+            await interaction_buffer.submit(events(3))
+        return interaction_buffer._get_queue().qsize()
+
+    assert asyncio.run(run()) == 3
+
+
+def test_batch_waits_for_room(small_buffer):
+    async def run():
+        queue = interaction_buffer._get_queue()
+        await interaction_buffer.submit(events(4))
+
+        async def drain():
+            await asyncio.sleep(0.01)
+            for _ in range(2):
+                queue.get_nowait()
+
+        await asyncio.gather(interaction_buffer.submit(events(3)), drain())
+        return queue.qsize()
+
+    assert asyncio.run(run()) == 5
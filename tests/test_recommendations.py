@@ -0,0 +1,59 @@
+import math
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from backend import recommendations, storage
+from backend.database import Base
+from backend.models import AffinityEpoch, NewsArticle, UserAffinity, UserInteraction
+
+
+def make_db(tmp_path) -> Session:
+    engine = storage.create_engine_from_url(f"sqlite:///{tmp_path / 'affinity.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = Session(engine)
+    db.add_all([
+        NewsArticle(id=1, title="a", url="http://example.com/1", category="business", source="Wire"),
+        NewsArticle(id=2, title="b", url="http://example.com/2", category="sports", source="Wire"),
+    ])
+    db.commit()
+    return db
+
+
+def interaction(article_id: int, ts: datetime, weight: float) -> UserInteraction:
+    return UserInteraction(article_id=article_id, user_id="u", interaction_type="click",
+                           timestamp=ts, interaction_weight=weight)
+
+
+def scores(db: Session) -> dict:
+    return {row.value: row.score for row in db.query(UserAffinity).filter(UserAffinity.kind == "category")}
+
+
+def test_short_half_life_far_from_epoch_does_not_overflow(tmp_path, monkeypatch):
+    monkeypatch.setattr(recommendations, "AFFINITY_HALF_LIFE_DAYS", 0.01)
+    db = make_db(tmp_path)
+    # ~100k half-lives after the initial epoch: 2 ** 100000 would overflow
+    recommendations.update_profiles(db, [interaction(1, datetime(2026, 10, 1), 2.0)])
+    db.commit()
+
+    assert all(math.isfinite(score) and score > 0 for score in scores(db).values())
+    assert db.query(AffinityEpoch).one().epoch > datetime(2026, 9, 30)
+
+
+def test_decay_order_survives_rebase(tmp_path, monkeypatch):
+    monkeypatch.setattr(recommendations, "AFFINITY_HALF_LIFE_DAYS", 1.0)
+    db = make_db(tmp_path)
+    start = datetime(2026, 1, 1)
+    recommendations.update_profiles(db, [interaction(1, start, 3.0)])
+    db.commit()
+    epoch = db.query(AffinityEpoch).one().epoch
+
+    # Far enough later to rebase again: business decays to ~3 * 2 ** -100, sports is fresh
+    later = start + timedelta(days=100)
+    recommendations.update_profiles(db, [interaction(2, later, 1.0)])
+    db.commit()
+
+    assert db.query(AffinityEpoch).one().epoch > epoch
+    result = scores(db)
+    assert result["sports"] > result["business"]
+    assert math.isclose(result["business"] / result["sports"], 3.0 * 2 ** -100, rel_tol=1e-6)
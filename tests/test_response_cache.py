@@ -0,0 +1,56 @@
+import asyncio
+
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from backend import response_cache
+
+
+async def latest(request):
+    if request.query_params.get("fail"):
+        return JSONResponse({"detail": "bad request"}, status_code=400)
+    if request.query_params.get("pending"):
+        return JSONResponse([{"id": 1, "translated_title": None}], headers={"Cache-Control": "no-store"})
+    return JSONResponse([{"id": 1, "title": "story"}])
+
+
+def make_client() -> httpx.AsyncClient:
+    app = response_cache.ResponseCacheMiddleware(Starlette(routes=[Route("/api/news/latest", latest)]))
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def test_locks_released_after_uncacheable_responses():
+    async def run():
+        async with make_client() as client:
+            responses = await asyncio.gather(
+                *(client.get("/api/news/latest", params={"fail": 1, "page": i}) for i in range(10))
+            )
+        return responses
+
+    responses = asyncio.run(run())
+    assert all(response.status_code == 400 for response in responses)
+    assert response_cache._locks == {}
+
+
+def test_locks_released_after_hit_and_miss():
+    async def run():
+        async with make_client() as client:
+            return [await client.get("/api/news/latest", params={"page": "hit"}) for _ in range(2)]
+
+    miss, hit = asyncio.run(run())
+    assert miss.headers["x-cache"] == "MISS"
+    assert hit.headers["x-cache"] == "HIT"
+    assert response_cache._locks == {}
+
+
+def test_no_store_responses_are_not_cached():
+    async def run():
+        async with make_client() as client:
+            return [await client.get("/api/news/latest", params={"pending": 1}) for _ in range(2)]
+
+    first, second = asyncio.run(run())
+    assert first.headers["cache-control"] == "no-store"
+    assert "x-cache" not in second.headers
+    assert response_cache._locks == {}
@@ -0,0 +1,41 @@
+import asyncio
+
+from fastapi import Response
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend import coldstart, storage
+from backend.database import Base
+from backend.routes import news
+
+
+def test_saved_pages_over_server_default_timestamps(tmp_path):
+    url = f"sqlite:///{tmp_path / 'saved.db'}"
+    engine = storage.create_engine_from_url(url)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        # No created_at: the server default stores CURRENT_TIMESTAMP text, like older databases
+        for i in range(7):
+            conn.execute(text("INSERT INTO articles (title, description, url, source, published_at) "
+                              "VALUES (:title, 'd', :url, 's', CURRENT_TIMESTAMP)"),
+                         {"title": f"story {i}", "url": f"http://example.com/{i}"})
+    coldstart.prepare_schema(engine)
+
+    async def pages():
+        async_engine = storage.create_async_engine_from_url(url)
+        seen, cursor = [], None
+        try:
+            async with AsyncSession(async_engine) as db:
+                for _ in range(10):
+                    page = await news.get_saved_news(Response(), limit=3, cursor=cursor, category=None,
+                                                     source=None, lang=None, db=db)
+                    seen.append([article.id for article in page["items"]])
+                    cursor = page["next_cursor"]
+                    if cursor is None:
+                        break
+        finally:
+            await async_engine.dispose()
+        return seen
+
+    assert asyncio.run(pages()) == [[7, 6, 5], [4, 3, 2], [1]]
+    engine.dispose()
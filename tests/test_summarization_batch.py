@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from backend import llm_cache
+from backend.routes import summarization
+
+
+@pytest.fixture
+def uncached(monkeypatch):
+    async def lookup(key):
+        return None
+
+    async def store(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr(llm_cache, "lookup", lookup)
+    monkeypatch.setattr(llm_cache, "store", store)
+
+
+def test_both_task_errors_are_reported(uncached, monkeypatch):
+    async def summarize(text, max_length):
+        raise HTTPException(status_code=502, detail="summary upstream down")
+
+    async def translate(text, target_lang):
+        raise RuntimeError("translation timed out")
+
+    monkeypatch.setattr(summarization, "summarize", summarize)
+    monkeypatch.setattr(summarization, "translate", translate)
+    request = summarization.BatchRequest(items=[
+        summarization.BatchItem(id="a", text="word " * 100, max_length=20, target_lang="es"),
+    ])
+
+    result = asyncio.run(summarization.process_batch(request))["results"][0]
+    assert result.summary is None and result.translation is None
+    assert result.errors == {"summarization": "summary upstream down", "translation": "translation timed out"}
+
+
+def test_successful_task_is_kept_next_to_a_failed_one(uncached, monkeypatch):
+    async def summarize(text, max_length):
+        return "short"
+
+    async def translate(text, target_lang):
+        raise RuntimeError("translation timed out")
+
+    monkeypatch.setattr(summarization, "summarize", summarize)
+    monkeypatch.setattr(summarization, "translate", translate)
+    request = summarization.BatchRequest(items=[
+        summarization.BatchItem(id="a", text="word " * 100, max_length=20, target_lang="es"),
+    ])
+
+    result = asyncio.run(summarization.process_batch(request))["results"][0]
+    assert result.summary == "short"
+    assert result.errors == {"translation": "translation timed out"}